@@ -73,6 +73,26 @@ def find_data_files():
     else:
         print(f"Warning: {img_hack_path} not found")
     
+    # Include the pre-parsed image URL manifest so the frozen app skips the HTML parse
+    img_manifest_path = os.path.join("src", "data", "img_url_manifest.json")
+    if os.path.exists(img_manifest_path):
+        data_files.append(f"--add-data={img_manifest_path};src/data")
+        print(f"Including image URL manifest: {img_manifest_path}")
+
+    # Include the static discovery documents the API clients are built from
+    try:
+        import googleapiclient
+        documents_dir = os.path.join(os.path.dirname(googleapiclient.__file__), "discovery_cache", "documents")
+        for document in ["sheets.v4.json", "drive.v3.json"]:
+            document_path = os.path.join(documents_dir, document)
+            if os.path.exists(document_path):
+                data_files.append(f"--add-data={document_path};googleapiclient/discovery_cache/documents")
+                print(f"Including discovery document: {document}")
+            else:
+                print(f"Warning: discovery document {document_path} not found")
+    except ImportError:
+        print("Warning: googleapiclient not installed, discovery documents not included")
+
     return data_files
 
 def build_executable():
@@ -1,43 +1,49 @@
 import sys
+# Loaded first so the timeline and the optional profile cover the imports below
+from src.startup_timeline import (
+    timeline, PROFILE_STARTUP_FLAG, QAPPLICATION_PHASE, CREDENTIAL_CHECK_PHASE, FIRST_PAINT_PHASE
+)
+
+# Only a real run owns the startup log and profile; importing main, e.g. from
+# tools/import_report.py, must not overwrite them
+if __name__ == "__main__":
+    timeline.open_log()
+    if PROFILE_STARTUP_FLAG in sys.argv:
+        sys.argv.remove(PROFILE_STARTUP_FLAG)
+        timeline.start_profiling()
+
 import asyncio
 import signal
 import traceback
 import os
+import importlib
+import threading
 from PyQt6.QtWidgets import QApplication, QMessageBox, QMainWindow, QVBoxLayout, QLabel, QPushButton, QWidget
 from PyQt6.QtCore import QTimer
 from PyQt6.QtGui import QIcon
 from qasync import QEventLoop
 from src.logger import logger
-from src.auth import google_auth
 
 # Log startup information
-startup_log_file = "startup_log.txt"
-try:
-    with open(startup_log_file, "w") as f:
-        f.write(f"Python version: {sys.version}\n")
-        f.write(f"Working directory: {os.getcwd()}\n")
-        f.write(f"Command line args: {sys.argv}\n")
-        f.write(f"Modules loaded: {list(sys.modules.keys())}\n")
-        f.write("Starting application...\n")
-except Exception as e:
-    print(f"Failed to write startup log: {str(e)}")
+timeline.log(f"Python version: {sys.version}")
+timeline.log(f"Working directory: {os.getcwd()}")
+timeline.log(f"Command line args: {sys.argv}")
+timeline.log(f"Modules loaded: {list(sys.modules.keys())}")
+timeline.log("Starting application...")
 
 # Try importing from exceptions, but use a safer approach
 try:
     from exceptions import LeagueClientError
-    with open(startup_log_file, "a") as f:
-        f.write("Imported LeagueClientError from exceptions\n")
+    timeline.log("Imported LeagueClientError from exceptions")
 except ImportError:
     try:
         from src.exceptions import LeagueClientError
-        with open(startup_log_file, "a") as f:
-            f.write("Imported LeagueClientError from src.exceptions\n")
+        timeline.log("Imported LeagueClientError from src.exceptions")
     except ImportError:
         # Define a fallback class if imports fail
         class LeagueClientError(Exception):
             pass
-        with open(startup_log_file, "a") as f:
-            f.write("Using fallback LeagueClientError definition\n")
+        timeline.log("Using fallback LeagueClientError definition")
         logger.error("Could not import LeagueClientError, using fallback definition")
 
 # Create a fallback main window in case the real one fails
@@ -90,12 +96,10 @@ real_main_window_available = False
 try:
     from src.ui.main_window import MainWindow
     real_main_window_available = True
-    with open(startup_log_file, "a") as f:
-        f.write("Imported MainWindow\n")
+    timeline.log("Imported MainWindow")
 except Exception as e:
     error_msg = f"Failed to import MainWindow: {str(e)}\n{traceback.format_exc()}"
-    with open(startup_log_file, "a") as f:
-        f.write(error_msg)
+    timeline.log(error_msg)
     logger.critical(error_msg)
     # We'll use the fallback MainWindow
 
@@ -112,6 +116,16 @@ async def shutdown(window):
             window.update_timer.stop()
             logger.info("Update timer stopped.")
             
+        # Stop listening for League Client events
+        if hasattr(window, 'stop_event_listener'):
+            window.stop_event_listener()
+            logger.info("Event listener stopped.")
+            
+        # Stop refreshing the OAuth token in the background
+        from src.auth import google_auth
+        google_auth.stop_token_refresher()
+        logger.info("Token refresher stopped.")
+            
         # Hide the tray icon if it exists
         if hasattr(window, 'tray_icon') and window.tray_icon:
             window.tray_icon.hide()
@@ -145,6 +159,18 @@ async def shutdown(window):
     except Exception as e:
         logger.error(f"Error during shutdown: {str(e)}", exc_info=True)
 
+def preload_modules(*module_names):
+    """Import modules on a background thread so they are ready when first used"""
+    def run():
+        for module_name in module_names:
+            try:
+                importlib.import_module(module_name)
+            except Exception as e:
+                logger.warning(f"Failed to preload {module_name}: {str(e)}")
+    thread = threading.Thread(target=run, name="module-preloader", daemon=True)
+    thread.start()
+    return thread
+
 def main():
     # Create app before anything else
     app = None
@@ -152,18 +178,20 @@ def main():
     critical_error = None
     
     try:
-        with open(startup_log_file, "a") as f:
-            f.write("Starting main function\n")
+        timeline.log("Starting main function")
+        
+        # Load the auth stack while Qt starts up, the credential check needs it next
+        preload_modules("src.auth.google_auth")
 
         # Initialize application
         try:
+            timeline.start(QAPPLICATION_PHASE)
             app = QApplication(sys.argv)
-            with open(startup_log_file, "a") as f:
-                f.write("Created QApplication\n")
+            timeline.end(QAPPLICATION_PHASE)
+            timeline.log("Created QApplication")
         except Exception as e:
             error_msg = f"Failed to create QApplication: {str(e)}\n{traceback.format_exc()}"
-            with open(startup_log_file, "a") as f:
-                f.write(error_msg)
+            timeline.log(error_msg)
             logger.critical(error_msg)
             critical_error = error_msg
             raise
@@ -173,27 +201,25 @@ def main():
             icon_path = "urgot_icon.png"
             if os.path.exists(icon_path):
                 app.setWindowIcon(QIcon(icon_path))
-                with open(startup_log_file, "a") as f:
-                    f.write(f"Set window icon: {icon_path}\n")
+                timeline.log(f"Set window icon: {icon_path}")
             else:
-                with open(startup_log_file, "a") as f:
-                    f.write(f"Icon not found: {icon_path}\n")
+                timeline.log(f"Icon not found: {icon_path}")
         except Exception as e:
-            with open(startup_log_file, "a") as f:
-                f.write(f"Failed to set icon: {str(e)}\n")
+            timeline.log(f"Failed to set icon: {str(e)}")
         
         # Check for credentials and show authentication wizard if needed
+        timeline.start(CREDENTIAL_CHECK_PHASE)
         try:
-            with open(startup_log_file, "a") as f:
-                f.write("Checking for Google credentials\n")
+            timeline.log("Checking for Google credentials")
+            
+            from src.auth import google_auth
             
             # Check if there's an existing token file
             token_exists = os.path.exists('token.json')
             client_secrets_exist = os.path.exists('client_secrets.json')
             
             if not client_secrets_exist:
-                with open(startup_log_file, "a") as f:
-                    f.write("Client secrets file missing. Cannot continue.\n")
+                timeline.log("Client secrets file missing. Cannot continue.")
                 
                 error_box = QMessageBox()
                 error_box.setIcon(QMessageBox.Icon.Critical)
@@ -213,24 +239,20 @@ def main():
             if token_exists:
                 # Verify the token still works
                 try:
-                    with open(startup_log_file, "a") as f:
-                        f.write("Token exists. Verifying if it's valid...\n")
+                    timeline.log("Token exists. Verifying if it's valid...")
                     
                     # Try loading credentials without forcing reauth
                     creds = google_auth.get_credentials(force_new_auth=False)
                     
                     if not creds:
-                        with open(startup_log_file, "a") as f:
-                            f.write("Existing token is invalid or expired.\n")
+                        timeline.log("Existing token is invalid or expired.")
                         needs_auth = True
                 except Exception as e:
-                    with open(startup_log_file, "a") as f:
-                        f.write(f"Error validating token: {str(e)}\n")
+                    timeline.log(f"Error validating token: {str(e)}")
                     needs_auth = True
             
             if needs_auth:
-                with open(startup_log_file, "a") as f:
-                    f.write("Need to show auth dialog.\n")
+                timeline.log("Need to show auth dialog.")
                 
                 # Import here to avoid circular imports
                 from src.ui.service_account_dialog import AuthInfoDialog
@@ -239,25 +261,21 @@ def main():
                 auth_dialog = AuthInfoDialog()
                 dialog_result = auth_dialog.exec()
                 
-                with open(startup_log_file, "a") as f:
-                    f.write(f"Auth dialog completed with result: {dialog_result}\n")
+                timeline.log(f"Auth dialog completed with result: {dialog_result}")
                 
                 # If user cancelled the dialog, exit
                 if dialog_result == 0:
-                    with open(startup_log_file, "a") as f:
-                        f.write("User cancelled authentication. Exiting.\n")
+                    timeline.log("User cancelled authentication. Exiting.")
                     logger.warning("Authentication cancelled by user.")
                     return
                 
                 # Start the authentication flow
-                with open(startup_log_file, "a") as f:
-                    f.write("Starting OAuth authentication flow.\n")
+                timeline.log("Starting OAuth authentication flow.")
                 
                 creds = google_auth.get_credentials(force_new_auth=True)
                 
                 if not creds:
-                    with open(startup_log_file, "a") as f:
-                        f.write("Authentication failed. Exiting.\n")
+                    timeline.log("Authentication failed. Exiting.")
                     
                     error_box = QMessageBox()
                     error_box.setIcon(QMessageBox.Icon.Critical)
@@ -271,52 +289,47 @@ def main():
                     error_box.exec()
                     return
                 
-                with open(startup_log_file, "a") as f:
-                    f.write("Authentication successful.\n")
+                timeline.log("Authentication successful.")
             else:
-                with open(startup_log_file, "a") as f:
-                    f.write("Valid token already exists. No need for authentication.\n")
+                timeline.log("Valid token already exists. No need for authentication.")
             
         except Exception as e:
-            with open(startup_log_file, "a") as f:
-                f.write(f"Error during authentication check: {str(e)}\n{traceback.format_exc()}\n")
+            timeline.log(f"Error during authentication check: {str(e)}\n{traceback.format_exc()}")
             logger.error(f"Error during authentication check: {str(e)}", exc_info=True)
             # Continue execution, the sheets manager will handle credential errors
+        timeline.end(CREDENTIAL_CHECK_PHASE)
             
         # Set up event loop with error handling
         loop = None
         try:
             loop = QEventLoop(app)
             asyncio.set_event_loop(loop)
-            with open(startup_log_file, "a") as f:
-                f.write("Created event loop\n")
+            timeline.log("Created event loop")
         except Exception as e:
             error_msg = f"Failed to create event loop: {str(e)}\n{traceback.format_exc()}"
-            with open(startup_log_file, "a") as f:
-                f.write(error_msg)
+            timeline.log(error_msg)
             logger.critical(error_msg)
             critical_error = error_msg
             raise
         
         # Create main window with error handling
+        timeline.start(FIRST_PAINT_PHASE)
         try:
             if real_main_window_available:
                 window = MainWindow()
-                with open(startup_log_file, "a") as f:
-                    f.write("Created MainWindow\n")
+                timeline.log("Created MainWindow")
             else:
                 window = MinimalMainWindow(critical_error)
-                with open(startup_log_file, "a") as f:
-                    f.write("Created MinimalMainWindow (fallback)\n")
+                timeline.log("Created MinimalMainWindow (fallback)")
                 critical_error = "Using fallback minimal UI due to MainWindow import failure"
                 
             window.show()
-            with open(startup_log_file, "a") as f:
-                f.write("Called window.show()\n")
+            timeline.log("Called window.show()")
+            # Runs once the event loop has processed the events queued by show()
+            QTimer.singleShot(0, lambda: timeline.end(FIRST_PAINT_PHASE))
         except Exception as e:
             error_msg = f"Failed to create or show window: {str(e)}\n{traceback.format_exc()}"
-            with open(startup_log_file, "a") as f:
-                f.write(error_msg)
+            timeline.log(error_msg)
             logger.critical(error_msg)
             critical_error = error_msg
             if window:
@@ -324,24 +337,20 @@ def main():
                     window.close()
                 except Exception as e:
                     logger.error(f"Error closing window: {str(e)}", exc_info=True)
-                    with open(startup_log_file, "a") as f:
-                        f.write(f"Error closing window: {str(e)}\n")
+                    timeline.log(f"Error closing window: {str(e)}")
             
             # Try to show a minimal fallback window
             try:
                 window = MinimalMainWindow(f"Error creating main window: {str(e)}")
                 window.show()
-                with open(startup_log_file, "a") as f:
-                    f.write("Created and showed fallback window after error\n")
+                timeline.log("Created and showed fallback window after error")
             except Exception as e2:
-                with open(startup_log_file, "a") as f:
-                    f.write(f"Failed to create fallback window: {str(e2)}\n")
+                timeline.log(f"Failed to create fallback window: {str(e2)}")
                 raise e  # Re-raise the original exception
         
         # Signal handler for graceful shutdown
         def handle_signal(*_):
-            with open(startup_log_file, "a") as f:
-                f.write("Received signal for shutdown\n")
+            timeline.log("Received signal for shutdown")
             logger.info("Received termination signal. Shutting down...")
             try:
                 # Create and await shutdown task
@@ -360,20 +369,17 @@ def main():
                         if app:
                             app.quit()
                             
-                        with open(startup_log_file, "a") as f:
-                            f.write("Stopped event loop and quit application\n")
+                        timeline.log("Stopped event loop and quit application")
                     except Exception as e:
                         logger.error(f"Error during termination: {str(e)}", exc_info=True)
-                        with open(startup_log_file, "a") as f:
-                            f.write(f"Error during termination: {str(e)}\n")
+                        timeline.log(f"Error during termination: {str(e)}")
                         loop.stop()
                 
                 # Allow up to 3 seconds for shutdown to complete
                 loop.call_later(3, terminate_app)
             except Exception as e:
                 logger.error(f"Error during signal handling: {str(e)}", exc_info=True)
-                with open(startup_log_file, "a") as f:
-                    f.write(f"Error during signal handling: {str(e)}\n")
+                timeline.log(f"Error during signal handling: {str(e)}")
                 # Stop the loop immediately in case of error
                 loop.stop()
                 if app:
@@ -382,22 +388,18 @@ def main():
         # Set up signal handlers with error handling
         for sig in (signal.SIGINT, signal.SIGTERM):
             try:
-                with open(startup_log_file, "a") as f:
-                    f.write(f"Setting up signal handler for {sig}\n")
+                timeline.log(f"Setting up signal handler for {sig}")
                 loop.add_signal_handler(sig, handle_signal)
             except NotImplementedError:
                 # add_signal_handler may not be implemented on Windows event loops
-                with open(startup_log_file, "a") as f:
-                    f.write(f"Using fallback signal handler for {sig}\n")
+                timeline.log(f"Using fallback signal handler for {sig}")
                 signal.signal(sig, handle_signal)
             except Exception as e:
                 logger.error(f"Error setting up signal handler for {sig}: {str(e)}", exc_info=True)
-                with open(startup_log_file, "a") as f:
-                    f.write(f"Error setting up signal handler for {sig}: {str(e)}\n")
+                timeline.log(f"Error setting up signal handler for {sig}: {str(e)}")
                 
         # Log that we're about to run the event loop
-        with open(startup_log_file, "a") as f:
-            f.write("About to run event loop\n")
+        timeline.log("About to run event loop")
         
         # Run the event loop
         with loop:
@@ -407,11 +409,9 @@ def main():
             keep_alive_timer.timeout.connect(lambda: None)  # Do nothing, just keep event loop active
             keep_alive_timer.start()
             
-            with open(startup_log_file, "a") as f:
-                f.write("Running event loop\n")
+            timeline.log("Running event loop")
             loop.run_forever()
-            with open(startup_log_file, "a") as f:
-                f.write("Event loop finished\n")
+            timeline.log("Event loop finished")
                 
             # Stop the keep-alive timer
             keep_alive_timer.stop()
@@ -419,34 +419,28 @@ def main():
     except LeagueClientError as e:
         # If League Client is not running, continue running the app but with a message
         logger.warning(f"League Client connection issue: {str(e)}")
-        with open(startup_log_file, "a") as f:
-            f.write(f"LeagueClientError: {str(e)}\n")
+        timeline.log(f"LeagueClientError: {str(e)}")
         if "window" in locals() and window:
             try:
                 if hasattr(window, 'show_client_connection_message'):
                     window.show_client_connection_message()
-                with open(startup_log_file, "a") as f:
-                    f.write("Showed client connection message\n")
+                timeline.log("Showed client connection message")
             except Exception as e2:
                 logger.error(f"Error showing client connection message: {str(e2)}", exc_info=True)
-                with open(startup_log_file, "a") as f:
-                    f.write(f"Error showing client connection message: {str(e2)}\n")
+                timeline.log(f"Error showing client connection message: {str(e2)}")
         # Continue execution
     except Exception as e:
         error_msg = f"Application error: {str(e)}\n{traceback.format_exc()}"
         logger.error(error_msg)
-        with open(startup_log_file, "a") as f:
-            f.write(error_msg)
+        timeline.log(error_msg)
         critical_error = error_msg
     finally:
-        with open(startup_log_file, "a") as f:
-            f.write("Entering finally block\n")
+        timeline.log("Entering finally block")
             
         # If we had a critical error, show a message box
         if critical_error and app:
             try:
-                with open(startup_log_file, "a") as f:
-                    f.write("Showing error message box\n")
+                timeline.log("Showing error message box")
                 error_box = QMessageBox()
                 error_box.setIcon(QMessageBox.Icon.Critical)
                 error_box.setWindowTitle("Application Error")
@@ -455,16 +449,14 @@ def main():
                 error_box.setStandardButtons(QMessageBox.StandardButton.Ok)
                 error_box.exec()
             except Exception as e:
-                with open(startup_log_file, "a") as f:
-                    f.write(f"Failed to show error box: {str(e)}\n")
+                timeline.log(f"Failed to show error box: {str(e)}")
             
         # Ensure app quits and any remaining resources are cleaned up
         try:
             if 'window' in locals() and window:
                 # Run cleanup one last time in case the signal handler didn't complete
                 try:
-                    with open(startup_log_file, "a") as f:
-                        f.write("Running final shutdown\n")
+                    timeline.log("Running final shutdown")
                     # Use a timeout to prevent blocking if the shutdown task doesn't complete
                     try:
                         # Create a new event loop for the final shutdown
@@ -476,50 +468,42 @@ def main():
                         final_loop.run_until_complete(asyncio.wait_for(shutdown_future, timeout=3.0))
                     except asyncio.TimeoutError:
                         logger.warning("Final shutdown timed out after 3 seconds")
-                        with open(startup_log_file, "a") as f:
-                            f.write("Final shutdown timed out after 3 seconds\n")
+                        timeline.log("Final shutdown timed out after 3 seconds")
                     except Exception as e:
                         logger.error(f"Error during final shutdown: {str(e)}", exc_info=True)
-                        with open(startup_log_file, "a") as f:
-                            f.write(f"Error during final shutdown: {str(e)}\n")
+                        timeline.log(f"Error during final shutdown: {str(e)}")
                 except Exception as e:
                     logger.error(f"Error during final shutdown: {str(e)}", exc_info=True)
-                    with open(startup_log_file, "a") as f:
-                        f.write(f"Error during final shutdown: {str(e)}\n")
+                    timeline.log(f"Error during final shutdown: {str(e)}")
         except Exception as e:
             logger.error(f"Error during final cleanup: {str(e)}", exc_info=True)
-            with open(startup_log_file, "a") as f:
-                f.write(f"Error during final cleanup: {str(e)}\n")
+            timeline.log(f"Error during final cleanup: {str(e)}")
         
         try:
             if app:
-                with open(startup_log_file, "a") as f:
-                    f.write("Quitting application\n")
+                timeline.log("Quitting application")
                 app.quit()
                 # Force app to process events and shut down
                 app.processEvents()
         except Exception as e:
             logger.error(f"Error quitting application: {str(e)}", exc_info=True)
-            with open(startup_log_file, "a") as f:
-                f.write(f"Error quitting application: {str(e)}\n")
+            timeline.log(f"Error quitting application: {str(e)}")
             
         logger.info("Application terminated.")
-        with open(startup_log_file, "a") as f:
-            f.write("Application terminated\n")
+        timeline.log("Application terminated")
+        timeline.close()
             
         # As a last resort, force exit
         sys.exit(0)
 
 if __name__ == "__main__":
     try:
-        with open(startup_log_file, "a") as f:
-            f.write("Calling main() function\n")
+        timeline.log("Calling main() function")
         main()
     except Exception as e:
         error_msg = f"Uncaught exception in main: {str(e)}\n{traceback.format_exc()}"
         logger.critical(error_msg)
-        with open(startup_log_file, "a") as f:
-            f.write(error_msg)
+        timeline.log(error_msg)
         try:
             app = QApplication.instance()
             if app:
@@ -532,6 +516,6 @@ if __name__ == "__main__":
                 error_box.exec()
         except Exception as e:
             logger.error(f"Error showing fatal error box: {str(e)}", exc_info=True)
-            with open(startup_log_file, "a") as f:
-                f.write(f"Error showing fatal error box: {str(e)}\n")
+            timeline.log(f"Error showing fatal error box: {str(e)}")
+        timeline.close()
         sys.exit(1) 
\ No newline at end of file
@@ -1,18 +1,23 @@
 import os
+import json
+import time
+import hashlib
 import webbrowser
 import socket
 import http.server
 import socketserver
 import threading
 import urllib.parse
+import tempfile
+from datetime import datetime
 from typing import Optional
 
-from google_auth_oauthlib.flow import InstalledAppFlow
-from google.auth.transport.requests import Request
+# The OAuth flow, HTTP transport and API client libraries are imported where
+# they are used, so loading a still valid token doesn't pay for them at startup
 from google.oauth2.credentials import Credentials
-from googleapiclient.discovery import build
-from googleapiclient.errors import HttpError
 
+from src.data import cache
+from src.data import service_factory
 from src.logger import logger
 
 # Set the scopes needed
@@ -27,6 +32,14 @@ REDIRECT_URI_FORMAT = 'http://localhost:{port}'
 DEFAULT_SECRETS_FILE = 'client_secrets.json'
 DEFAULT_TOKEN_FILE = 'token.json'
 TARGET_SPREADSHEET_ID = '1wcrN6SRX1EsEce4s2HL8GBIa1CjPVG5L32mW9ml7K3s'
+# Successful access checks are remembered so startup doesn't repeat them
+ACCESS_ATTESTATION_FILE = 'access_attestation.json'
+ACCESS_ATTESTATION_TTL = 12 * 60 * 60  # seconds
+# Refresh the access token this long before it expires, well ahead of google-auth's own threshold
+TOKEN_REFRESH_MARGIN = 10 * 60  # seconds
+TOKEN_REFRESH_RETRY_DELAY = 60  # seconds
+# 403 reasons that mean access to the spreadsheet was actually refused
+PERMISSION_ERROR_REASONS = frozenset({'forbidden', 'insufficientPermissions', 'ACCESS_TOKEN_SCOPE_INSUFFICIENT'})
 
 # Success HTML page shown after authentication
 AUTH_COMPLETE_HTML = """
@@ -210,6 +223,7 @@ def get_credentials(force_new_auth=False) -> Optional[Credentials]:
         if creds and creds.expired and creds.refresh_token:
             logger.info("Refreshing expired credentials")
             try:
+                from google.auth.transport.requests import Request
                 creds.refresh(Request())
             except Exception as e:
                 logger.error(f"Error refreshing credentials: {str(e)}", exc_info=True)
@@ -230,6 +244,7 @@ def get_credentials(force_new_auth=False) -> Optional[Credentials]:
                 server.start_server()
                 
                 # Set up the flow with the local server
+                from google_auth_oauthlib.flow import InstalledAppFlow
                 flow = InstalledAppFlow.from_client_secrets_file(
                     DEFAULT_SECRETS_FILE, 
                     scopes=SCOPES,
@@ -265,22 +280,31 @@ def get_credentials(force_new_auth=False) -> Optional[Credentials]:
                 logger.error(f"Error during authentication flow: {str(e)}", exc_info=True)
                 return None
     
-    # Verify the user has access to the sheet
-    if not verify_sheet_access(creds):
+    # Verify the user has access to the sheet, unless that was confirmed recently
+    if has_access_attestation(creds):
+        logger.info("Spreadsheet access verified recently, skipping check")
+    elif not verify_sheet_access(creds):
         logger.error("User does not have access to the required spreadsheet")
         return None
     
     return creds
 
 def save_credentials(creds: Credentials) -> bool:
-    """Save credentials to the token file."""
+    """Save credentials to the token file, replacing it atomically."""
     try:
         token_dir = os.path.dirname(DEFAULT_TOKEN_FILE)
         if token_dir and not os.path.exists(token_dir):
             os.makedirs(token_dir)
-            
-        with open(DEFAULT_TOKEN_FILE, 'w') as f:
-            f.write(creds.to_json())
+        
+        # Write next to the token file and swap it in, so a crash never leaves it truncated
+        fd, tmp_path = tempfile.mkstemp(dir=token_dir or '.', suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w') as f:
+                f.write(creds.to_json())
+            os.replace(tmp_path, DEFAULT_TOKEN_FILE)
+        finally:
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
         
         logger.info(f"Saved credentials to {DEFAULT_TOKEN_FILE}")
         return True
@@ -288,6 +312,86 @@ def save_credentials(creds: Credentials) -> bool:
         logger.error(f"Error saving credentials to {DEFAULT_TOKEN_FILE}: {str(e)}", exc_info=True)
         return False
 
+class TokenRefresher:
+    """Refresh credentials shortly before they expire on a background thread.
+
+    Data calls then always find a valid access token instead of stopping
+    to refresh it synchronously.
+    """
+    
+    def __init__(self, creds: Credentials, margin: float = TOKEN_REFRESH_MARGIN):
+        self.creds = creds
+        self.margin = margin
+        self._stop_event = threading.Event()
+        self._thread = None
+    
+    def start(self):
+        """Start the refresher thread if it isn't running yet."""
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, name="token-refresher", daemon=True)
+        self._thread.start()
+        logger.info("Started background token refresher")
+    
+    def stop(self):
+        """Stop the refresher thread."""
+        self._stop_event.set()
+    
+    def seconds_until_refresh(self) -> Optional[float]:
+        """Seconds until the token should be refreshed, or None if it never expires."""
+        if not self.creds.expiry:
+            return None
+        # google-auth keeps expiry as a naive UTC datetime
+        remaining = (self.creds.expiry - datetime.utcnow()).total_seconds()
+        return max(0.0, remaining - self.margin)
+    
+    def refresh(self):
+        """Refresh the access token now and persist it."""
+        from google.auth.transport.requests import Request
+        self.creds.refresh(Request())
+        save_credentials(self.creds)
+        logger.info(f"Refreshed access token in the background, valid until {self.creds.expiry} UTC")
+    
+    def _run(self):
+        while not self._stop_event.is_set():
+            wait = self.seconds_until_refresh()
+            if wait is None or not self.creds.refresh_token:
+                logger.info("Credentials can't be refreshed ahead of time, stopping token refresher")
+                return
+            if self._stop_event.wait(wait):
+                return
+            try:
+                self.refresh()
+            except Exception as e:
+                logger.error(f"Error refreshing credentials in the background: {str(e)}", exc_info=True)
+                self._stop_event.wait(TOKEN_REFRESH_RETRY_DELAY)
+
+_token_refresher = None
+_token_refresher_lock = threading.Lock()
+
+def start_token_refresher(creds: Credentials) -> Optional[TokenRefresher]:
+    """Keep the given credentials fresh in the background, replacing any previous refresher."""
+    global _token_refresher
+    if not creds:
+        return None
+    with _token_refresher_lock:
+        if _token_refresher is not None and _token_refresher.creds is creds:
+            return _token_refresher
+        if _token_refresher is not None:
+            _token_refresher.stop()
+        _token_refresher = TokenRefresher(creds)
+        _token_refresher.start()
+        return _token_refresher
+
+def stop_token_refresher():
+    """Stop the background token refresher, if one is running."""
+    global _token_refresher
+    with _token_refresher_lock:
+        if _token_refresher is not None:
+            _token_refresher.stop()
+            _token_refresher = None
+
 def verify_sheet_access(creds: Credentials) -> bool:
     """
     Verify that the user has access to the required spreadsheet.
@@ -298,9 +402,10 @@ def verify_sheet_access(creds: Credentials) -> bool:
     Returns:
         True if the user has access, False otherwise
     """
+    from googleapiclient.errors import HttpError
     try:
-        # Build the Sheets API client
-        service = build('sheets', 'v4', credentials=creds)
+        # Reuse the Sheets API client the data layer will use for these credentials
+        service = service_factory.get_service('sheets', 'v4', creds)
         
         # Try to access basic metadata from the spreadsheet
         # This will fail if the user doesn't have access
@@ -311,10 +416,13 @@ def verify_sheet_access(creds: Credentials) -> bool:
         
         sheet_title = result.get('properties', {}).get('title', '')
         logger.info(f"Successfully verified access to spreadsheet: {sheet_title}")
+        record_access_attestation(creds)
         return True
         
     except HttpError as e:
         if e.resp.status == 403:  # Forbidden - No access
+            if is_permission_error(e):
+                invalidate_access_attestation()
             logger.error("User does not have access to the required spreadsheet")
         elif e.resp.status == 404:  # Not Found
             logger.error("Spreadsheet not found. It may have been deleted or moved.")
@@ -325,8 +433,66 @@ def verify_sheet_access(creds: Credentials) -> bool:
         logger.error(f"Error verifying sheet access: {str(e)}", exc_info=True)
         return False
 
+def _credentials_fingerprint(creds: Credentials) -> str:
+    """Identify the signed-in user without storing their token."""
+    # The refresh token survives access token refreshes, so the attestation does too
+    identity = creds.refresh_token or creds.token or ''
+    return hashlib.sha256(f"{creds.client_id}:{identity}".encode('utf-8')).hexdigest()
+
+def has_access_attestation(creds: Credentials, spreadsheet_id: str = TARGET_SPREADSHEET_ID) -> bool:
+    """Check whether access to the spreadsheet was verified recently for these credentials."""
+    attestation = cache.read_json(ACCESS_ATTESTATION_FILE)
+    if not attestation:
+        return False
+    return (
+        attestation.get('fingerprint') == _credentials_fingerprint(creds)
+        and attestation.get('spreadsheet_id') == spreadsheet_id
+        and time.time() - attestation.get('verified_at', 0) < ACCESS_ATTESTATION_TTL
+    )
+
+def record_access_attestation(creds: Credentials, spreadsheet_id: str = TARGET_SPREADSHEET_ID) -> bool:
+    """Remember that these credentials can read the spreadsheet."""
+    return cache.write_json(ACCESS_ATTESTATION_FILE, {
+        'fingerprint': _credentials_fingerprint(creds),
+        'spreadsheet_id': spreadsheet_id,
+        'verified_at': time.time(),
+    })
+
+def is_permission_error(error) -> bool:
+    """Check whether an HttpError means the spreadsheet itself is not accessible.
+
+    Quota and API configuration errors are also 403s but say nothing about
+    access, so only permission reasons count.
+    """
+    if error.resp.status != 403:
+        return False
+    try:
+        details = json.loads(error.content.decode('utf-8')).get('error', {})
+    except (AttributeError, UnicodeDecodeError, ValueError):
+        return False
+    # Drive style errors list reasons, Sheets v4 may add ErrorInfo details
+    reasons = {
+        item.get('reason') for item in details.get('errors', []) + details.get('details', [])
+        if isinstance(item, dict) and item.get('reason')
+    }
+    if reasons:
+        return bool(reasons & PERMISSION_ERROR_REASONS)
+    return details.get('status') == 'PERMISSION_DENIED'
+
+def invalidate_access_attestation():
+    """Forget a previous access check, e.g. after a data call was refused with 403."""
+    path = os.path.join(cache.CACHE_DIR, ACCESS_ATTESTATION_FILE)
+    try:
+        if os.path.exists(path):
+            os.remove(path)
+            logger.info("Cleared cached spreadsheet access attestation")
+    except OSError as e:
+        logger.error(f"Error removing access attestation {path}: {str(e)}")
+
 def force_reauthentication() -> bool:
     """Force re-authentication by removing the token file."""
+    invalidate_access_attestation()
+    service_factory.clear_services()
     try:
         if os.path.exists(DEFAULT_TOKEN_FILE):
             os.remove(DEFAULT_TOKEN_FILE)
@@ -0,0 +1,60 @@
+from typing import Dict, List, Optional
+from src.data import cache
+from src.logger import logger
+
+CATALOG_FILE = 'champion_catalog.json'
+
+class ChampionCatalog:
+    """Champion ID to name mapping, cached in memory and on disk per client version."""
+
+    def __init__(self):
+        self.version = None
+        self.names: Dict[int, str] = {}
+
+    def __len__(self):
+        return len(self.names)
+
+    def get_name(self, champion_id) -> Optional[str]:
+        """Get the champion name for an ID, or None if it isn't in the catalog"""
+        return self.names.get(int(champion_id))
+
+    def clear(self):
+        """Forget the loaded catalog, e.g. after the client restarted"""
+        self.version = None
+        self.names = {}
+
+    def load_from_disk(self, version: str) -> bool:
+        """Load the catalog saved for the given client version"""
+        if not version:
+            return False
+        data = cache.read_json(CATALOG_FILE)
+        if not data or data.get('version') != version:
+            return False
+        try:
+            self.names = {int(champion_id): name for champion_id, name in data['names'].items()}
+        except (KeyError, ValueError, AttributeError) as e:
+            logger.warning(f"Ignoring malformed champion catalog cache: {str(e)}")
+            return False
+        self.version = version
+        logger.info(f"Loaded {len(self.names)} champions from catalog cache for client version {version}")
+        return True
+
+    def update(self, version: Optional[str], summary: List[dict]):
+        """Replace the catalog with a champion-summary.json payload and persist it"""
+        names = {}
+        for entry in summary or []:
+            champion_id = entry.get('id')
+            name = entry.get('name')
+            # The summary includes a "None" placeholder with ID -1
+            if champion_id is None or champion_id < 0 or not name:
+                continue
+            names[int(champion_id)] = name
+        self.names = names
+        self.version = version
+        logger.info(f"Champion catalog updated with {len(names)} champions for client version {version}")
+
+        if version:
+            cache.write_json(CATALOG_FILE, {
+                'version': version,
+                'names': {str(champion_id): name for champion_id, name in names.items()},
+            })
@@ -1,11 +1,31 @@
 import aiohttp
+import asyncio
 import ssl
 import base64
+import json
 import psutil
 import re
+import time
 from src.logger import logger
+from src.core.champion_catalog import ChampionCatalog
 from exceptions import LeagueClientError
 
+# Limits for per-champion lookups against the LCU API
+MAX_CONCURRENT_REQUESTS = 5
+REQUEST_TIMEOUT = 3  # seconds
+# Wait before repeating a bulk catalog fetch that failed
+CATALOG_RETRY_DELAY = 60  # seconds
+
+CHAMPION_SUMMARY_ENDPOINT = '/lol-game-data/assets/v1/champion-summary.json'
+GAME_VERSION_ENDPOINT = '/lol-patch/v1/game-version'
+
+# LCU WebSocket (WAMP 1.0) message types and event topics
+WAMP_SUBSCRIBE = 5
+WAMP_EVENT = 8
+GAMEFLOW_PHASE_EVENT = 'OnJsonApiEvent_lol-gameflow_v1_gameflow-phase'
+CHAMP_SELECT_SESSION_EVENT = 'OnJsonApiEvent_lol-champ-select_v1_session'
+WEBSOCKET_HEARTBEAT = 30  # seconds
+
 class LeagueClient:
     def __init__(self):
         self.port = None
@@ -13,6 +33,10 @@ class LeagueClient:
         self.session = None
         self.base_url = None
         self.client_running = False
+        self.champion_catalog = ChampionCatalog()
+        # Created on the event loop, __init__ runs in an executor thread
+        self._catalog_lock = None
+        self._catalog_failed_at = None
         try:
             self._discover_lcu()
             self.client_running = True
@@ -45,6 +69,9 @@ class LeagueClient:
         try:
             self._discover_lcu()
             self.client_running = True
+            # The client may have been patched while it was closed
+            self.champion_catalog.clear()
+            self._catalog_failed_at = None
             logger.info("Successfully reconnected to League Client")
             return True
         except LeagueClientError:
@@ -81,6 +108,7 @@ class LeagueClient:
                     logger.error(f"Failed to fetch champion select session: {resp.status}")
                     raise LeagueClientError(f"Failed to fetch champion select session: {resp.status}")
         except Exception as e:
+            await self._check_connection_lost(e)
             logger.error(f"Error getting champion select session: {str(e)}", exc_info=True)
             raise LeagueClientError(f"Failed to get champion select session: {str(e)}")
 
@@ -89,11 +117,18 @@ class LeagueClient:
             session_data = await self.get_champion_select_session()
             if not session_data:
                 return []
-            enemy_champions = []
-            my_team = None
             
             # Get the session data as a dictionary
             session = session_data if isinstance(session_data, dict) else await session_data.json()
+            return await self.resolve_enemy_champions(session)
+        except Exception as e:
+            logger.error(f"Error getting enemy champions: {str(e)}", exc_info=True)
+            raise LeagueClientError(f"Failed to get enemy champions: {str(e)}")
+
+    async def resolve_enemy_champions(self, session):
+        """Get the enemy champion names from a champion select session payload"""
+        try:
+            my_team = None
             
             # Debug log the session structure to help diagnose issues
             logger.debug(f"Champion select session data keys: {list(session.keys())}")
@@ -115,39 +150,134 @@ class LeagueClient:
             enemy_team_list = session.get(enemy_team, [])
             logger.debug(f"Found {len(enemy_team_list)} players in enemy team")
             
-            for i, player in enumerate(enemy_team_list):
-                logger.debug(f"Processing enemy player {i+1}/{len(enemy_team_list)}")
-                if player.get('championId') and player['championId'] != 0:
-                    champ_id = player['championId']
-                    logger.debug(f"Found champion ID: {champ_id}")
-                    try:
-                        champ_data = await self.get_champion_data(champ_id)
-                        if champ_data and 'name' in champ_data:
-                            enemy_champions.append(champ_data['name'])
-                            logger.debug(f"Successfully added champion: {champ_data['name']} (ID: {champ_id})")
-                        else:
-                            logger.warning(f"Champion data for ID {champ_id} missing 'name' property")
-                    except Exception as champ_e:
-                        logger.error(f"Error fetching champion data for ID {champ_id}: {str(champ_e)}", exc_info=True)
+            champ_ids = [
+                player['championId'] for player in enemy_team_list
+                if player.get('championId') and player['championId'] != 0
+            ]
+            logger.debug(f"Found champion IDs: {champ_ids}")
+            
+            # Resolve names from the champion catalog, no HTTP calls once it is loaded
+            await self._ensure_champion_catalog()
+            names = [self.champion_catalog.get_name(champ_id) for champ_id in champ_ids]
+            
+            # Fall back to per-champion lookups for IDs missing from the catalog,
+            # resolved concurrently (gather keeps the team order)
+            missing = [i for i, name in enumerate(names) if not name]
+            if missing:
+                logger.debug(f"Champion IDs missing from catalog: {[champ_ids[i] for i in missing]}")
+                semaphore = asyncio.Semaphore(MAX_CONCURRENT_REQUESTS)
+                resolved = await asyncio.gather(*(self._resolve_champion_name(champ_ids[i], semaphore) for i in missing))
+                for i, name in zip(missing, resolved):
+                    names[i] = name
+            enemy_champions = [name for name in names if name]
             
             logger.info(f"Total enemy champions detected: {len(enemy_champions)} - {', '.join(enemy_champions)}")
             return enemy_champions
         except Exception as e:
-            logger.error(f"Error getting enemy champions: {str(e)}", exc_info=True)
-            raise LeagueClientError(f"Failed to get enemy champions: {str(e)}")
+            logger.error(f"Error resolving enemy champions: {str(e)}", exc_info=True)
+            raise LeagueClientError(f"Failed to resolve enemy champions: {str(e)}")
+
+    async def _ensure_champion_catalog(self):
+        """Load the champion catalog from disk or with a single bulk LCU request"""
+        if len(self.champion_catalog) or self._catalog_backing_off():
+            return
+        if self._catalog_lock is None:
+            self._catalog_lock = asyncio.Lock()
+        async with self._catalog_lock:
+            if len(self.champion_catalog) or self._catalog_backing_off():
+                return
+            try:
+                version = await self.get_client_version()
+            except LeagueClientError as e:
+                logger.warning(f"Could not determine client version, catalog won't be cached: {str(e)}")
+                version = None
+            
+            if self.champion_catalog.load_from_disk(version):
+                return
+            
+            try:
+                summary = await self.get_champion_summary()
+                self.champion_catalog.update(version, summary)
+                self._catalog_failed_at = None
+            except LeagueClientError as e:
+                logger.warning(f"Could not load champion catalog, using per-champion lookups for {CATALOG_RETRY_DELAY}s: {str(e)}")
+                self._catalog_failed_at = time.monotonic()
+
+    def _catalog_backing_off(self):
+        """Whether a recent bulk catalog fetch failed and shouldn't be retried yet"""
+        return (self._catalog_failed_at is not None
+                and time.monotonic() - self._catalog_failed_at < CATALOG_RETRY_DELAY)
+
+    async def get_client_version(self):
+        try:
+            session = await self._get_session()
+            url = f'{self.base_url}{GAME_VERSION_ENDPOINT}'
+            timeout = aiohttp.ClientTimeout(total=REQUEST_TIMEOUT)
+            async with session.get(url, timeout=timeout) as resp:
+                if resp.status == 200:
+                    version = await resp.json()
+                    logger.debug(f"League Client game version: {version}")
+                    return version
+                else:
+                    logger.error(f"Failed to fetch client version: {resp.status}")
+                    raise LeagueClientError(f"Failed to fetch client version: {resp.status}")
+        except LeagueClientError:
+            raise
+        except Exception as e:
+            await self._check_connection_lost(e)
+            logger.error(f"Error getting client version: {str(e)}", exc_info=True)
+            raise LeagueClientError(f"Failed to get client version: {str(e)}")
+
+    async def get_champion_summary(self):
+        try:
+            session = await self._get_session()
+            url = f'{self.base_url}{CHAMPION_SUMMARY_ENDPOINT}'
+            timeout = aiohttp.ClientTimeout(total=REQUEST_TIMEOUT * 3)
+            async with session.get(url, timeout=timeout) as resp:
+                if resp.status == 200:
+                    logger.debug("Successfully fetched champion summary from LCU API")
+                    return await resp.json()
+                else:
+                    logger.error(f"Failed to fetch champion summary: {resp.status}")
+                    raise LeagueClientError(f"Failed to fetch champion summary: {resp.status}")
+        except LeagueClientError:
+            raise
+        except Exception as e:
+            await self._check_connection_lost(e)
+            logger.error(f"Error getting champion summary: {str(e)}", exc_info=True)
+            raise LeagueClientError(f"Failed to get champion summary: {str(e)}")
+
+    async def _resolve_champion_name(self, champ_id, semaphore):
+        """Look up a champion's name, returning None if it could not be resolved"""
+        async with semaphore:
+            try:
+                champ_data = await self.get_champion_data(champ_id)
+            except Exception as champ_e:
+                logger.error(f"Error fetching champion data for ID {champ_id}: {str(champ_e)}", exc_info=True)
+                return None
+        if champ_data and 'name' in champ_data:
+            logger.debug(f"Successfully added champion: {champ_data['name']} (ID: {champ_id})")
+            return champ_data['name']
+        logger.warning(f"Champion data for ID {champ_id} missing 'name' property")
+        return None
 
     async def get_champion_data(self, champion_id):
         try:
             session = await self._get_session()
             url = f'{self.base_url}/lol-champions/v1/champions/{champion_id}'
-            async with session.get(url) as resp:
+            timeout = aiohttp.ClientTimeout(total=REQUEST_TIMEOUT)
+            async with session.get(url, timeout=timeout) as resp:
                 if resp.status == 200:
                     logger.debug(f"Successfully fetched champion data for ID {champion_id} from LCU API")
                     return await resp.json()
                 else:
                     logger.error(f"Failed to fetch champion data: {resp.status}")
                     raise LeagueClientError(f"Failed to fetch champion data: {resp.status}")
+        except asyncio.TimeoutError:
+            logger.error(f"Timed out fetching champion data for ID {champion_id}")
+            raise LeagueClientError(f"Timed out fetching champion data for ID {champion_id}")
         except Exception as e:
+            await self._check_connection_lost(e)
             logger.error(f"Error getting champion data: {str(e)}", exc_info=True)
             raise LeagueClientError(f"Failed to get champion data: {str(e)}")
 
@@ -165,9 +295,77 @@ class LeagueClient:
                     logger.error(f"Failed to fetch gameflow phase: {resp.status}")
                     raise LeagueClientError(f"Failed to fetch gameflow phase: {resp.status}")
         except Exception as e:
+            await self._check_connection_lost(e)
             logger.error(f"Error getting gameflow phase: {str(e)}", exc_info=True)
             raise LeagueClientError(f"Failed to get gameflow phase: {str(e)}")
 
+    async def listen_events(self, on_gameflow_phase=None, on_champ_select_session=None, on_connected=None):
+        """Subscribe to LCU WebSocket events and dispatch them until the connection closes.
+        
+        Callbacks may be plain functions or coroutines. on_gameflow_phase receives
+        the phase string, on_champ_select_session the session payload (None when
+        champion select ends) and on_connected is called once subscriptions are sent.
+        """
+        handlers = {
+            GAMEFLOW_PHASE_EVENT: on_gameflow_phase,
+            CHAMP_SELECT_SESSION_EVENT: on_champ_select_session,
+        }
+        try:
+            session = await self._get_session()
+            url = f'wss://127.0.0.1:{self.port}/'
+            async with session.ws_connect(url, protocols=('wamp',), heartbeat=WEBSOCKET_HEARTBEAT) as ws:
+                for event in handlers:
+                    await ws.send_json([WAMP_SUBSCRIBE, event])
+                logger.info("Subscribed to League Client WebSocket events")
+                await self._dispatch_event(on_connected)
+                
+                async for msg in ws:
+                    if msg.type == aiohttp.WSMsgType.TEXT:
+                        # The client acknowledges subscriptions with empty frames
+                        if not msg.data:
+                            continue
+                        payload = json.loads(msg.data)
+                        if len(payload) < 3 or payload[0] != WAMP_EVENT:
+                            continue
+                        topic, event = payload[1], payload[2]
+                        data = None if event.get('eventType') == 'Delete' else event.get('data')
+                        logger.debug(f"Received LCU event {topic} ({event.get('eventType')})")
+                        await self._dispatch_event(handlers.get(topic), data)
+                    elif msg.type in (aiohttp.WSMsgType.CLOSED, aiohttp.WSMsgType.ERROR):
+                        break
+            logger.info("League Client WebSocket closed")
+            # Usually the client exiting or restarting on a new port and token
+            await self._connection_lost()
+        except LeagueClientError:
+            raise
+        except Exception as e:
+            await self._check_connection_lost(e)
+            logger.warning(f"League Client WebSocket error: {str(e)}")
+            raise LeagueClientError(f"League Client WebSocket error: {str(e)}")
+
+    async def _check_connection_lost(self, error):
+        """Drop the connection if a request failed because the client went away"""
+        if isinstance(error, aiohttp.ClientConnectionError):
+            await self._connection_lost()
+
+    async def _connection_lost(self):
+        """Forget the session so the next request rediscovers the client's port and token"""
+        if self.client_running:
+            logger.info("Lost connection to League Client")
+        self.client_running = False
+        await self.close()
+
+    async def _dispatch_event(self, callback, *args):
+        """Call an event callback, keeping the listener alive if it fails"""
+        if callback is None:
+            return
+        try:
+            result = callback(*args)
+            if asyncio.iscoroutine(result):
+                await result
+        except Exception as e:
+            logger.error(f"Error handling League Client event: {str(e)}", exc_info=True)
+
     async def close(self):
         if self.session:
             await self.session.close()
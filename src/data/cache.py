@@ -0,0 +1,60 @@
+"""
+Local on-disk cache helpers shared by the data layer.
+"""
+import json
+import os
+import tempfile
+from typing import Any, Optional
+
+from src.logger import logger
+
+APP_CACHE_NAME = 'UrgotMatchupHelper'
+
+
+def _default_cache_dir() -> str:
+    """Return the per-user cache directory for this application."""
+    if os.name == 'nt' and os.getenv('LOCALAPPDATA'):
+        return os.path.join(os.getenv('LOCALAPPDATA'), APP_CACHE_NAME, 'Cache')
+    base = os.getenv('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache')
+    return os.path.join(base, APP_CACHE_NAME)
+
+
+CACHE_DIR = os.getenv('URGOT_CACHE_DIR') or _default_cache_dir()
+
+
+def cache_path(*parts: str) -> str:
+    """Build a path inside the cache directory, creating parent folders as needed."""
+    path = os.path.join(CACHE_DIR, *parts)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    return path
+
+
+def read_json(name: str) -> Optional[Any]:
+    """Read a JSON document from the cache, returning None if it is missing or unreadable."""
+    path = os.path.join(CACHE_DIR, name)
+    if not os.path.exists(path):
+        return None
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except Exception as e:
+        logger.warning(f"Ignoring unreadable cache file {path}: {str(e)}")
+        return None
+
+
+def write_json(name: str, data: Any) -> bool:
+    """Atomically write a JSON document to the cache."""
+    path = cache_path(name)
+    try:
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(data, f, separators=(',', ':'))
+            os.replace(tmp_path, path)
+        finally:
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+        return True
+    except Exception as e:
+        logger.error(f"Error writing cache file {path}: {str(e)}", exc_info=True)
+        return False
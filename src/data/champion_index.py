@@ -0,0 +1,49 @@
+"""
+Normalized champion name lookups shared by the sheet manager and the UI.
+"""
+import re
+from typing import Dict, Generic, Iterable, Optional, Tuple, TypeVar
+
+T = TypeVar('T')
+
+_NON_ALNUM = re.compile(r'[^a-z0-9]+')
+
+# Normalized alternate names -> normalized canonical name
+ALIASES = {
+    'monkeyking': 'wukong',
+    'nunu': 'nunuwillump',
+    'nunuandwillump': 'nunuwillump',
+    'renata': 'renataglasc',
+}
+
+
+def normalize_champion_name(name: str) -> str:
+    """Fold case, punctuation and whitespace, e.g. "Kai'Sa" -> "kaisa"
+
+    Aliases resolve to the same key, so "MonkeyKing" and "Wukong" match.
+    """
+    key = _NON_ALNUM.sub('', name.lower())
+    return ALIASES.get(key, key)
+
+
+class ChampionIndex(Generic[T]):
+    """Map champion names to values through their normalized key."""
+
+    def __init__(self, items: Iterable[Tuple[str, T]] = ()):
+        self._entries: Dict[str, T] = {}
+        for name, value in items:
+            self.add(name, value)
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, name: str) -> bool:
+        return normalize_champion_name(name) in self._entries
+
+    def add(self, name: str, value: T):
+        """Add a champion, keeping the first value if the name is already indexed"""
+        self._entries.setdefault(normalize_champion_name(name), value)
+
+    def get(self, name: str, default: Optional[T] = None) -> Optional[T]:
+        """Get the value for a champion name, or default if it isn't indexed"""
+        return self._entries.get(normalize_champion_name(name), default)
@@ -1,14 +1,23 @@
 import os
 import sys
-from typing import List
+import json
+import hashlib
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional
 from googleapiclient.errors import HttpError
-import googleapiclient.discovery
 import time
 
 # Add the src directory to the Python path
 sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
 
 from src.data import image_hack
+from src.data import cache
+from src.data import service_factory
+from src.data.matchup_table import MatchupTable
+from src.data.rate_limiter import RetryPolicy, TokenBucket
 from src.logger import logger
 from src.exceptions import GoogleSheetsError
 from src.auth import google_auth
@@ -20,14 +29,52 @@ logger.info(f"Credentials file exists: {os.path.exists('credentials.json')}")
 logger.info(f"Token file exists: {os.path.exists('token.json')}")
 
 # Rate limiting constants
-MAX_RETRIES = 3
+MAX_RETRIES = 5
 INITIAL_RETRY_DELAY = 1  # seconds
 MAX_RETRY_DELAY = 32  # seconds
-RATE_LIMIT_DELAY = 1  # seconds between requests
+REQUESTS_PER_MINUTE = 60  # Sheets read quota per user, shared with Drive metadata calls
+REQUEST_BURST = 5  # requests allowed back to back before throttling kicks in
+
+# Local snapshot of the parsed sheet, bump the version when its layout changes
+SNAPSHOT_FILE = 'matchups_snapshot.json'
+SNAPSHOT_VERSION = 2
+
+# Sheet ranges fetched together in one batchGet request, keyed by the name used in sheet_ranges.
+# Add new tabs here; every range is downloaded, hashed and snapshotted as one unit.
+MATCHUPS_RANGE = 'matchups'
+SHEET_RANGES = {
+    MATCHUPS_RANGE: 'Matchups!A1:Z',  # Load all rows in the Matchups sheet
+}
+
+@dataclass(frozen=True)
+class SheetData:
+    """One parsed version of the sheet.
+
+    A load builds a new instance and publishes it with a single reference
+    assignment, so readers holding one never see rows from two versions.
+    """
+    ranges: Dict[str, List[List[str]]]
+    matchups_data: List[List[str]]
+    champions_list: List[str]
+    champion_to_row: Dict[str, int]
+    matchup_table: MatchupTable
+    data_hash: Optional[str]
+
+    @classmethod
+    def empty(cls) -> 'SheetData':
+        return cls({}, [], [], {}, MatchupTable.empty(), None)
 
 class GoogleSheetsManager:
-    def __init__(self, spreadsheet_id: str = None):
-        """Initialize the Google Sheets manager with the spreadsheet ID."""
+    def __init__(self, spreadsheet_id: str = None, background_refresh: bool = True,
+                 blocking_load: bool = True):
+        """Initialize the Google Sheets manager with the spreadsheet ID.
+
+        If a local snapshot of the sheet exists it is loaded immediately and,
+        when ``background_refresh`` is set, revalidated against Google Sheets
+        on a background thread. Without a snapshot the sheet is loaded
+        synchronously, unless ``blocking_load`` is False, in which case the
+        caller is expected to await ``refresh_data_async()``.
+        """
         # Use a default spreadsheet ID if none provided
         self.spreadsheet_id = spreadsheet_id or "1wcrN6SRX1EsEce4s2HL8GBIa1CjPVG5L32mW9ml7K3s"
         logger.info(f"Initializing GoogleSheetsManager with spreadsheet ID: {self.spreadsheet_id}")
@@ -35,70 +82,324 @@ class GoogleSheetsManager:
         self.creds = self._get_credentials()
         self.sheets_service = self._get_sheets_service()
         self.drive_service = self._get_drive_service()
-        self.last_request_time = 0
+        # One bucket for every Sheets and Drive call so bursts share the quota
+        self.rate_limiter = TokenBucket.per_minute(REQUESTS_PER_MINUTE, REQUEST_BURST)
+        self.retry_policy = RetryPolicy(MAX_RETRIES, INITIAL_RETRY_DELAY, MAX_RETRY_DELAY)
         
-        # Cache for storing sheet data
-        self.matchups_data = None
-        self.champions_list = None
+        # Current sheet data, None until a snapshot or download is loaded
+        self.data: Optional[SheetData] = None
+        self.remote_revision = None
+        self._data_listeners: List[Callable[[SheetData], None]] = []
         
-        self.image_hack_data = image_hack.get_champion_urls()
+        # Single worker so API calls never run concurrently on the shared HTTP client
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="sheets")
+        self._refresh_future = None
         
-        # Load sheet data on initialization
-        self._load_sheets_data()
+        self.image_hack_data = image_hack.get_champion_urls()
         
-    def _load_sheets_data(self):
-        """Load all relevant data from the Google Sheet at once to minimize API calls."""
+        # Warm start from the local snapshot, falling back to a blocking load
+        if self._load_snapshot():
+            if background_refresh:
+                self.start_background_refresh()
+        elif blocking_load:
+            self._load_sheets_data()
+
+    @property
+    def sheet_ranges(self) -> Dict[str, List[List[str]]]:
+        return self.data.ranges if self.data else {}
+
+    @property
+    def matchups_data(self) -> Optional[List[List[str]]]:
+        return self.data.matchups_data if self.data else None
+
+    @property
+    def champions_list(self) -> Optional[List[str]]:
+        return self.data.champions_list if self.data else None
+
+    @property
+    def champion_to_row(self) -> Dict[str, int]:
+        return self.data.champion_to_row if self.data else {}
+
+    @property
+    def matchup_table(self) -> MatchupTable:
+        """Per-champion columns parsed from matchups_data, looked up by normalized name"""
+        return self.data.matchup_table if self.data else MatchupTable.empty()
+
+    @property
+    def data_hash(self) -> Optional[str]:
+        return self.data.data_hash if self.data else None
+
+    def add_data_listener(self, callback: Callable[[SheetData], None]):
+        """Call ``callback(data)`` whenever a load replaces the sheet data.
+
+        Callbacks run on the thread that did the load, which is the worker
+        thread for background refreshes.
+        """
+        self._data_listeners.append(callback)
+
+    def _publish(self, data: SheetData):
+        """Swap in new sheet data and notify the listeners."""
+        self.data = data
+        for callback in list(self._data_listeners):
+            try:
+                callback(data)
+            except Exception as e:
+                logger.error(f"Error notifying sheet data listener: {str(e)}", exc_info=True)
+
+    @staticmethod
+    def _parse_value_ranges(result: dict) -> Dict[str, List[List[str]]]:
+        """Map a batchGet response back onto the SHEET_RANGES keys."""
+        # valueRanges come back in request order
+        value_ranges = result.get('valueRanges', [])
+        return {
+            key: value_range.get('values', [])
+            for key, value_range in zip(SHEET_RANGES, value_ranges)
+        }
+
+    def _fetch_sheet_ranges(self) -> Dict[str, List[List[str]]]:
+        """Download the raw values of every range in SHEET_RANGES in one request."""
+        result = self._execute_with_retry(
+            self.sheets_service.spreadsheets().values().batchGet,
+            spreadsheetId=self.spreadsheet_id,
+            ranges=list(SHEET_RANGES.values()),
+            sheet_access=True
+        )
+        return self._parse_value_ranges(result)
+
+    @staticmethod
+    def _hash_values(values) -> str:
+        """Compute a stable content hash of the raw sheet values."""
+        encoded = json.dumps(values, separators=(',', ':'), ensure_ascii=False, sort_keys=True).encode('utf-8')
+        return hashlib.sha256(encoded).hexdigest()
+
+    async def _fetch_sheet_ranges_async(self) -> Dict[str, List[List[str]]]:
+        """Download every range in SHEET_RANGES without blocking the event loop."""
+        result = await self._execute_with_retry_async(
+            self.sheets_service.spreadsheets().values().batchGet,
+            spreadsheetId=self.spreadsheet_id,
+            ranges=list(SHEET_RANGES.values()),
+            sheet_access=True
+        )
+        return self._parse_value_ranges(result)
+
+    @staticmethod
+    def _parse_revision(result: dict) -> str:
+        """Build a revision marker from a Drive files.get response."""
+        revision = f"{result.get('version', '')}@{result.get('modifiedTime', '')}"
+        logger.debug(f"Remote spreadsheet revision: {revision}")
+        return revision
+
+    def _fetch_remote_revision(self) -> Optional[str]:
+        """Get the spreadsheet's Drive version and modifiedTime as a revision marker.
+
+        Returns None if the metadata could not be fetched.
+        """
         try:
-            logger.info("Loading all matchup data from Google Sheets...")
-            # Load the entire Matchups sheet
             result = self._execute_with_retry(
-                self.sheets_service.spreadsheets().values().get,
-                spreadsheetId=self.spreadsheet_id,
-                range='Matchups!A1:Z'  # Load all rows in the Matchups sheet
+                self.drive_service.files().get,
+                fileId=self.spreadsheet_id,
+                fields='version,modifiedTime'
+            )
+        except GoogleSheetsError as e:
+            logger.warning(f"Could not fetch spreadsheet revision from Drive: {str(e)}")
+            return None
+        return self._parse_revision(result)
+
+    async def _fetch_remote_revision_async(self) -> Optional[str]:
+        """Async variant of _fetch_remote_revision."""
+        try:
+            result = await self._execute_with_retry_async(
+                self.drive_service.files().get,
+                fileId=self.spreadsheet_id,
+                fields='version,modifiedTime'
             )
-            
-            self.matchups_data = result.get('values', [])
-            logger.info(f"Successfully loaded data for {len(self.matchups_data)} rows")
-            
-            # Log the headers to understand the column structure
-            if self.matchups_data and len(self.matchups_data) > 0:
-                logger.debug(f"Headers: {self.matchups_data[0]}")
-            
-            # Extract list of champions (champions are usually in column B, index 1)
-            # Skip first few rows which might be headers
-            start_row = 0
-            for i in range(min(10, len(self.matchups_data))):
-                if len(self.matchups_data[i]) > 1 and self.matchups_data[i][1].strip().lower() in ['aatrox', 'ahri', 'akali', 'alistar']:
-                    start_row = i
-                    logger.debug(f"Found champion row starting at index {start_row}")
-                    break
-            
-            self.champions_list = []
-            for row in self.matchups_data[start_row:]:
-                if len(row) > 1 and row[1].strip():
-                    self.champions_list.append(row[1].strip())
-            
-            logger.info(f"Extracted {len(self.champions_list)} champion names")
-            logger.debug(f"Champion examples: {', '.join(self.champions_list[:5])}")
-            
-            # Create a dictionary of champion name to row index for faster lookups
-            self.champion_to_row = {}
-            for idx, row in enumerate(self.matchups_data[start_row:], start=start_row):
-                if len(row) > 1 and row[1].strip():
-                    self.champion_to_row[row[1].strip().lower()] = idx
-            
-            logger.debug(f"Created mapping for {len(self.champion_to_row)} champions")
-                
+        except GoogleSheetsError as e:
+            logger.warning(f"Could not fetch spreadsheet revision from Drive: {str(e)}")
+            return None
+        return self._parse_revision(result)
+
+    def _load_sheets_data(self, revision: Optional[str] = None) -> bool:
+        """Load all relevant data from the Google Sheet at once to minimize API calls.
+
+        Args:
+            revision: Drive revision marker the download corresponds to, if known
+
+        Returns True if the cached data was replaced with new content.
+        """
+        try:
+            logger.info("Loading all matchup data from Google Sheets...")
+            # Load every configured range in a single round trip
+            ranges = self._fetch_sheet_ranges()
+            return self._store_sheet_ranges(ranges, revision)
+        except Exception as e:
+            self._handle_load_error(e)
+            return False
+
+    async def _load_sheets_data_async(self, revision: Optional[str] = None) -> bool:
+        """Async variant of _load_sheets_data."""
+        try:
+            logger.info("Loading all matchup data from Google Sheets (async)...")
+            ranges = await self._fetch_sheet_ranges_async()
+            return self._store_sheet_ranges(ranges, revision)
         except Exception as e:
-            logger.error(f"Error loading sheet data: {str(e)}", exc_info=True)
-            # Initialize empty data structures if loading fails
-            self.matchups_data = []
-            self.champions_list = []
-            self.champion_to_row = {}
+            self._handle_load_error(e)
+            return False
+
+    def _handle_load_error(self, error: Exception):
+        """Log a failed sheet load and make sure the cache is usable."""
+        logger.error(f"Error loading sheet data: {str(error)}", exc_info=True)
+        # Initialize empty data structures if loading fails and nothing is cached
+        if self.data is None:
+            self.data = SheetData.empty()
+
+    def _store_sheet_ranges(self, ranges: Dict[str, List[List[str]]], revision: Optional[str]) -> bool:
+        """Swap freshly downloaded ranges into the cache if their content changed."""
+        logger.info(f"Successfully loaded data for {', '.join(f'{key}: {len(values)} rows' for key, values in ranges.items())}")
+        
+        values_hash = self._hash_values(ranges)
+        if values_hash == self.data_hash:
+            logger.info("Sheet data unchanged since last load, keeping cached data")
+            if revision and revision != self.remote_revision:
+                self.remote_revision = revision
+                self._save_snapshot()
+            return False
+        
+        self.remote_revision = revision
+        
+        self._apply_sheet_ranges(ranges, values_hash)
+        self._save_snapshot()
+        return True
 
-    def refresh_data(self):
-        """Refresh all data from the Google Sheet."""
-        self._load_sheets_data()
+    def _apply_sheet_ranges(self, ranges: Dict[str, List[List[str]]], values_hash: str):
+        """Parse every downloaded range and publish them together as the cached data."""
+        values = ranges.get(MATCHUPS_RANGE, [])
+        champions_list, champion_to_row, matchup_table = self._parse_matchups(values)
+        self._publish(SheetData(ranges, values, champions_list, champion_to_row, matchup_table, values_hash))
+
+    def _parse_matchups(self, values: List[List[str]]):
+        """Parse the raw Matchups values into the champion list, row mapping and table."""
+        # Log the headers to understand the column structure
+        if values and len(values) > 0:
+            logger.debug(f"Headers: {values[0]}")
+        
+        # Extract list of champions (champions are usually in column B, index 1)
+        # Skip first few rows which might be headers
+        start_row = 0
+        for i in range(min(10, len(values))):
+            if len(values[i]) > 1 and values[i][1].strip().lower() in ['aatrox', 'ahri', 'akali', 'alistar']:
+                start_row = i
+                logger.debug(f"Found champion row starting at index {start_row}")
+                break
+        
+        champions_list = []
+        for row in values[start_row:]:
+            if len(row) > 1 and row[1].strip():
+                champions_list.append(row[1].strip())
+        
+        logger.info(f"Extracted {len(champions_list)} champion names")
+        logger.debug(f"Champion examples: {', '.join(champions_list[:5])}")
+        
+        # Create a dictionary of champion name to row index for faster lookups
+        champion_to_row = {}
+        for idx, row in enumerate(values[start_row:], start=start_row):
+            if len(row) > 1 and row[1].strip():
+                champion_to_row[row[1].strip().lower()] = idx
+        
+        logger.debug(f"Created mapping for {len(champion_to_row)} champions")
+        matchup_table = MatchupTable.from_values(values, champions_list, champion_to_row, self.image_hack_data)
+        return champions_list, champion_to_row, matchup_table
+
+    def _load_snapshot(self) -> bool:
+        """Load the parsed sheet from the local snapshot file, if it is usable."""
+        snapshot = cache.read_json(SNAPSHOT_FILE)
+        if not snapshot:
+            logger.info("No local sheet snapshot found")
+            return False
+        
+        if (snapshot.get('version') != SNAPSHOT_VERSION or snapshot.get('spreadsheet_id') != self.spreadsheet_id
+                or snapshot.get('range_config') != SHEET_RANGES):
+            logger.info("Local sheet snapshot is outdated or for another spreadsheet, ignoring it")
+            return False
+        
+        try:
+            ranges = snapshot['ranges']
+            values = ranges[MATCHUPS_RANGE]
+            champions_list = snapshot['champions_list']
+            champion_to_row = snapshot['champion_to_row']
+            data = SheetData(
+                ranges, values, champions_list, champion_to_row,
+                MatchupTable.from_values(values, champions_list, champion_to_row, self.image_hack_data),
+                snapshot['hash']
+            )
+        except KeyError as e:
+            logger.warning(f"Local sheet snapshot is missing {str(e)}, ignoring it")
+            return False
+        
+        self.remote_revision = snapshot.get('revision')
+        self._publish(data)
+        logger.info(f"Loaded {len(data.champions_list)} champions from local snapshot saved at {snapshot.get('saved_at')}")
+        return True
+
+    def _save_snapshot(self) -> bool:
+        """Persist the parsed sheet to the local snapshot file."""
+        data = self.data
+        if data is None:
+            return False
+        return cache.write_json(SNAPSHOT_FILE, {
+            'version': SNAPSHOT_VERSION,
+            'spreadsheet_id': self.spreadsheet_id,
+            'saved_at': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'hash': data.data_hash,
+            'revision': self.remote_revision,
+            'range_config': SHEET_RANGES,
+            'ranges': data.ranges,
+            'champions_list': data.champions_list,
+            'champion_to_row': data.champion_to_row,
+        })
+
+    def refresh_data(self, revalidate: bool = True) -> bool:
+        """Refresh all data from the Google Sheet.
+
+        Args:
+            revalidate: If True and data is already cached, ask Drive for the
+                spreadsheet revision first and skip the download when it is unchanged
+
+        Returns True if the sheet content changed.
+        """
+        revision = None
+        if revalidate and self.data_hash:
+            revision = self._fetch_remote_revision()
+            if revision and revision == self.remote_revision:
+                logger.info(f"Spreadsheet unchanged (revision {revision}), skipping download")
+                return False
+        return self._load_sheets_data(revision)
+
+    async def refresh_data_async(self, revalidate: bool = True) -> bool:
+        """Refresh all data from the Google Sheet without blocking the event loop.
+
+        Same semantics as refresh_data(), but API calls run on the manager's
+        worker thread and waits use asyncio.sleep.
+        """
+        revision = None
+        if revalidate and self.data_hash:
+            revision = await self._fetch_remote_revision_async()
+            if revision and revision == self.remote_revision:
+                logger.info(f"Spreadsheet unchanged (revision {revision}), skipping download")
+                return False
+        return await self._load_sheets_data_async(revision)
+
+    async def ensure_data_async(self):
+        """Make sure sheet data is available, loading it asynchronously if needed."""
+        if not self.champions_list:
+            await self.refresh_data_async(revalidate=False)
+
+    def start_background_refresh(self):
+        """Refresh the sheet data on the manager's worker thread."""
+        if self._refresh_future and not self._refresh_future.done():
+            logger.debug("Background sheet refresh already running")
+            return
+        self._refresh_future = self._executor.submit(self.refresh_data)
+        logger.info("Started background sheet refresh")
 
     def _get_credentials(self):
         """Get credentials for both Sheets and Drive APIs using the auth module."""
@@ -107,256 +408,145 @@ class GoogleSheetsManager:
             logger.error("Failed to obtain Google credentials")
             # This will likely cause API calls to fail, but we can continue
             # and let the API call handlers deal with the errors
+        else:
+            # Renew the token ahead of expiry so data calls never block on OAuth
+            google_auth.start_token_refresher(creds)
         return creds
 
     def _get_sheets_service(self):
         """Get the Google Sheets service."""
-        return googleapiclient.discovery.build('sheets', 'v4', credentials=self.creds)
+        return service_factory.get_service('sheets', 'v4', self.creds)
 
     def _get_drive_service(self):
         """Get the Google Drive service."""
-        return googleapiclient.discovery.build('drive', 'v3', credentials=self.creds)
-
-    def _rate_limit(self):
-        """Implement rate limiting to avoid hitting API limits."""
-        current_time = time.time()
-        time_since_last_request = current_time - self.last_request_time
-        if time_since_last_request < RATE_LIMIT_DELAY:
-            sleep_time = RATE_LIMIT_DELAY - time_since_last_request
-            time.sleep(sleep_time)
-        self.last_request_time = time.time()
-
-    def _execute_with_retry(self, request_func, *args, **kwargs):
-        """Execute a request with retry logic for rate limits."""
-        retry_delay = INITIAL_RETRY_DELAY
-        for attempt in range(MAX_RETRIES):
+        return service_factory.get_service('drive', 'v3', self.creds)
+
+    def _retry_delay(self, error: HttpError, attempt: int) -> Optional[float]:
+        """Get the wait before retrying a failed request, or None if it shouldn't be retried."""
+        status = error.resp.status
+        if not self.retry_policy.should_retry(status, attempt):
+            return None
+        delay = self.retry_policy.delay(attempt, error.resp.get('retry-after'))
+        logger.warning(f"Google API returned {status}, retrying in {delay:.1f} seconds...")
+        return delay
+
+    def _execute_with_retry(self, request_func, *args, sheet_access: bool = False, **kwargs):
+        """Execute a request with rate limiting and retries for throttling and server errors.
+
+        Args:
+            sheet_access: The request reads spreadsheet data, so a permission
+                error means access to the sheet was revoked
+        """
+        for attempt in range(self.retry_policy.max_attempts):
             try:
-                self._rate_limit()
+                self.rate_limiter.acquire()
                 return request_func(*args, **kwargs).execute()
             except HttpError as e:
-                if e.resp.status == 429:  # Rate limit exceeded
-                    if attempt < MAX_RETRIES - 1:
-                        logger.warning(f"Rate limit exceeded, retrying in {retry_delay} seconds...")
-                        time.sleep(retry_delay)
-                        retry_delay = min(retry_delay * 2, MAX_RETRY_DELAY)
-                        continue
+                if sheet_access and google_auth.is_permission_error(e):
+                    # Access was revoked, make the next startup check it again
+                    google_auth.invalidate_access_attestation()
+                delay = self._retry_delay(e, attempt)
+                if delay is not None:
+                    time.sleep(delay)
+                    continue
+                raise GoogleSheetsError(f"Error accessing Google Sheets: {str(e)}")
+            except Exception as e:
+                raise GoogleSheetsError(f"Error accessing Google Sheets: {str(e)}")
+
+    async def _execute_with_retry_async(self, request_func, *args, sheet_access: bool = False, **kwargs):
+        """Execute a request on the worker thread with rate limiting and retries.
+
+        The blocking .execute() call runs in the manager's executor and all
+        waits use asyncio.sleep, so the event loop stays responsive. Arguments
+        are the same as for _execute_with_retry.
+        """
+        loop = asyncio.get_running_loop()
+        for attempt in range(self.retry_policy.max_attempts):
+            try:
+                await self.rate_limiter.acquire_async()
+                request = request_func(*args, **kwargs)
+                return await loop.run_in_executor(self._executor, request.execute)
+            except HttpError as e:
+                if sheet_access and google_auth.is_permission_error(e):
+                    # Access was revoked, make the next startup check it again
+                    google_auth.invalidate_access_attestation()
+                delay = self._retry_delay(e, attempt)
+                if delay is not None:
+                    await asyncio.sleep(delay)
+                    continue
                 raise GoogleSheetsError(f"Error accessing Google Sheets: {str(e)}")
             except Exception as e:
                 raise GoogleSheetsError(f"Error accessing Google Sheets: {str(e)}")
     
     def get_all_champions(self) -> List[str]:
-        """Get a list of all champions from the cached data."""
-        if not self.champions_list:
-            # If cache is empty, try to reload
-            self._load_sheets_data()
-            if not self.champions_list:
-                logger.error("Failed to load champions list from cache")
-                return []
-        
-        return self.champions_list
+        """Get a list of all champions from the cached data.
 
-    def _find_champion_row_index(self, champion: str) -> int:
-        """Find the index of the champion in the cached data."""
-        champion = champion.strip().lower()
-        logger.debug(f"Looking for champion '{champion}' in champion map")
-        
-        # Use the champion_to_row mapping for faster lookup
-        if hasattr(self, 'champion_to_row') and champion in self.champion_to_row:
-            row_idx = self.champion_to_row[champion]
-            logger.debug(f"Found champion '{champion}' at row index {row_idx} using mapping")
-            
-            # Log the entire row for debugging
-            if row_idx >= 0 and row_idx < len(self.matchups_data):
-                row = self.matchups_data[row_idx]
-                logger.debug(f"Champion '{champion}' row data: {row}")
-                
-            return row_idx
+        Never touches the network, await ensure_data_async() or
+        refresh_data_async() first when the data may not be loaded yet.
+        """
+        champions_list = self.champions_list
+        if not champions_list:
+            logger.warning("Champions list requested before the sheet data was loaded")
+            return []
         
-        # Fallback to linear search if mapping doesn't exist or champion not found
-        logger.debug(f"Falling back to linear search for champion '{champion}' in {len(self.matchups_data)} rows")
-        for idx, row in enumerate(self.matchups_data):
-            if len(row) > 1:
-                row_champion = row[1].strip().lower()
-                if row_champion == champion:
-                    logger.debug(f"Found champion '{champion}' at row index {idx}")
-                    
-                    # Log the entire row for debugging
-                    logger.debug(f"Champion '{champion}' row data: {row}")
-                    
-                    return idx
-        
-        logger.warning(f"Champion '{champion}' not found in any row")
-        return -1
+        return champions_list
+
+    def _find_champion(self, champion: str):
+        """Get the current matchup table and the champion's position in it.
+
+        Both come from the same table so a concurrent refresh can't mix versions.
+        Names are normalized, so "Kai'Sa", "kaisa" and aliases like "MonkeyKing" all match.
+        """
+        table = self.matchup_table
+        return table, table.position(champion.strip())
 
     def get_champion_runes(self, champion: str) -> str:
         """Get runes for a specific champion from cached data."""
-        try:
-            champion = champion.strip()
-            row_idx = self._find_champion_row_index(champion)
-            if row_idx >= 0:
-                #TODO: Implement this better, for now use image hack
-                # Find champion position out of total champions
-                champion_position = self.champions_list.index(champion.upper())
-                # Get runes from image hack list
-                
-                return self.image_hack_data[champion_position][0]
-            return ""
-        except Exception as e:
-            logger.error(f"Error getting runes for {champion}: {str(e)}")
-            return ""
+        table, position = self._find_champion(champion)
+        return table.rune(position)
 
     def get_summoner_spells(self, champion: str) -> str:
         """Get summoner spells for a specific champion from cached data."""
-        try:
-            champion = champion.strip()
-            row_idx = self._find_champion_row_index(champion)
-            if row_idx >= 0:
-                #TODO: Implement this better, for now use image hack
-                # Find champion position out of total champions
-                champion_position = self.champions_list.index(champion.upper())
-                # Get Summoner Spells from image hack list
-                
-                return self.image_hack_data[champion_position][1]
-            return ""
-        except Exception as e:
-            logger.error(f"Error getting summoner spells for {champion}: {str(e)}")
-            return ""
+        table, position = self._find_champion(champion)
+        return table.summoner_spell(position)
 
     def get_matchup_tldr(self, champion: str) -> str:
         """Get the TL;DR for a specific matchup from column D."""
-        try:
-            champion = champion.strip()
-            row_idx = self._find_champion_row_index(champion)
-            if row_idx >= 0:
-                row = self.matchups_data[row_idx]
-                # If the overview is in column D (index 3)
-                if len(row) > 3 and row[3]:
-                    return row[3]
-            return ''
-        except Exception as e:
-            logger.error(f"Error getting matchup TL;DR for {champion}: {str(e)}")
-            return ""
+        table, position = self._find_champion(champion)
+        return table.overview(position)
 
     def get_matchup_gameplay(self, champion: str) -> str:
-        """Get gameplay tips for a specific matchup from column F."""
-        try:
-            champion = champion.strip()
-            row_idx = self._find_champion_row_index(champion)
-            if row_idx >= 0:
-                row = self.matchups_data[row_idx]
-                
-                # Return content from column E (index 4)
-                if len(row) > 4 and row[4]:
-                    return row[4]
-                    
-                logger.warning(f"No gameplay data in column F for {champion}")
-                return ""
-            
-            logger.warning(f"Could not find row for champion {champion}")
-            return ""
-        except Exception as e:
-            logger.error(f"Error getting gameplay for {champion}: {str(e)}")
-            return ""
+        """Get gameplay tips for a specific matchup from column E."""
+        table, position = self._find_champion(champion)
+        return table.gameplay_text(position)
 
     def get_matchup_difficulty(self, champion: str) -> str:
         """Get the matchup difficulty string for the given champion from cached data."""
-        try:
-            champion = champion.strip()
-            row_idx = self._find_champion_row_index(champion) + 2 # Offset by 2 to account for placement
-            logger.debug(f"Looking for difficulty of {champion} at row index {row_idx}")
-            
-            if row_idx >= 0 and row_idx < len(self.matchups_data):
-                row = self.matchups_data[row_idx]
-                logger.debug(f"Row data for {champion}: {row}")
-                # First check column C (index 2)
-                if len(row) > 2 and row[2]:
-                    logger.debug(f"Found difficulty in column C (index 2): {row[2]}")
-                    return row[2]
-            
-            logger.warning(f"Invalid row index {row_idx} for champion {champion}")
-            return 'Unknown'
-        except Exception as e:
-            logger.error(f"Error getting matchup difficulty for {champion}: {str(e)}", exc_info=True)
-            return 'Unknown'
+        table, position = self._find_champion(champion)
+        return table.difficulty_label(position)
 
     def create_gameplay_dict(self, champion: str) -> dict:
         """Create a dictionary of gameplay sections for the given champion."""
-        try:
-            champion = champion.strip()
-            gameplay_text = self.get_matchup_gameplay(champion)
-            
-            sections = {
-                "early_game": "",
-                "how_to_trade": "",
-                "what_to_watch_out_for": "",
-                "tips": ""
-            }
-            
-            if gameplay_text:
-                # Parse the gameplay text into sections
-                import re
-                
-                # Define section markers to search for
-                section_markers = [
-                    r'EARLY\s*GAME:?',
-                    r'HOW\s*TO\s*TRADE:?|TRADING:?',
-                    r'WHAT\s*TO\s*WATCH\s*OUT\s*FOR:?|WATCH\s*OUT:?',
-                    r'TIPS:?'
-                ]
-                
-                # Combine section markers into a single pattern for splitting
-                section_pattern = '|'.join(f'({marker})' for marker in section_markers)
-                
-                # Find all section headers in the text
-                matches = list(re.finditer(section_pattern, gameplay_text, re.IGNORECASE))
-                
-                # Process each section
-                for i, match in enumerate(matches):
-                    # Get section name
-                    section_text = match.group(0).strip().upper()
-                    start_pos = match.end()
-                    
-                    # Determine section key
-                    if re.search(r'EARLY', section_text, re.IGNORECASE):
-                        section_key = "early_game"
-                    elif re.search(r'TRADE|TRADING', section_text, re.IGNORECASE):
-                        section_key = "how_to_trade"
-                    elif re.search(r'WATCH', section_text, re.IGNORECASE):
-                        section_key = "what_to_watch_out_for"
-                    elif re.search(r'TIPS', section_text, re.IGNORECASE):
-                        section_key = "tips"
-                    else:
-                        continue
-                    
-                    # Find end position (next section start or end of text)
-                    if i < len(matches) - 1:
-                        end_pos = matches[i + 1].start()
-                    else:
-                        end_pos = len(gameplay_text)
-                    
-                    # Extract content
-                    content = gameplay_text[start_pos:end_pos].strip()
-                    
-                    # Clean up content
-                    if content.startswith(':'):
-                        content = content[1:].strip()
-                    
-                    sections[section_key] = content
-                
-                # If no sections were found, put all content in early_game
-                if not any(sections.values()) and gameplay_text.strip():
-                    sections["early_game"] = gameplay_text.strip()
-            
-            return sections
-            
-        except Exception as e:
-            logger.error(f"Error creating gameplay dictionary for {champion}: {str(e)}", exc_info=True)
-            return {
-                "early_game": "",
-                "how_to_trade": "",
-                "what_to_watch_out_for": "",
-                "tips": ""
-            }
+        table, position = self._find_champion(champion)
+        return table.gameplay_sections(position)
+
+_shared_manager = None
+_shared_manager_lock = threading.Lock()
+
+def get_shared_manager(spreadsheet_id: str = None, **kwargs) -> GoogleSheetsManager:
+    """Get the process-wide GoogleSheetsManager, creating it on first use.
+
+    Keyword arguments are passed to the constructor and only take effect
+    for the call that creates the instance.
+    """
+    global _shared_manager
+    with _shared_manager_lock:
+        if _shared_manager is None:
+            _shared_manager = GoogleSheetsManager(spreadsheet_id, **kwargs)
+        elif spreadsheet_id and spreadsheet_id != _shared_manager.spreadsheet_id:
+            logger.warning(f"Shared GoogleSheetsManager already uses spreadsheet {_shared_manager.spreadsheet_id}, "
+                           f"ignoring requested {spreadsheet_id}")
+        return _shared_manager
 
 if __name__ == "__main__":
     manager = GoogleSheetsManager(os.getenv('SHEET_ID'))
@@ -0,0 +1,150 @@
+"""
+Bounded on-disk cache for downloaded images, with LRU eviction and HTTP validators.
+"""
+import atexit
+import hashlib
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Optional
+
+from src.data import cache
+from src.logger import logger
+
+IMAGE_CACHE_DIR = 'images'
+INDEX_FILE = os.path.join(IMAGE_CACHE_DIR, 'index.json')
+MAX_CACHE_BYTES = 64 * 1024 * 1024  # 64MB
+# Index changes are batched and written this long after the first one, off the calling thread
+INDEX_SAVE_DELAY = 2  # seconds
+
+
+class DiskImageCache:
+    """Store image bytes keyed by URL, evicting the least recently used entries."""
+
+    def __init__(self, max_bytes: int = MAX_CACHE_BYTES):
+        self.max_bytes = max_bytes
+        self.directory = os.path.join(cache.CACHE_DIR, IMAGE_CACHE_DIR)
+        self._lock = threading.Lock()
+        # url -> {'file', 'size', 'etag', 'last_modified', 'last_access'}, oldest first
+        self.entries: "OrderedDict[str, dict]" = OrderedDict()
+        self._save_timer = None
+        self._load_index()
+        # Write out access times still waiting for the timer
+        atexit.register(self.flush)
+
+    def _load_index(self):
+        """Load the cache index, dropping entries whose files are gone"""
+        index = cache.read_json(INDEX_FILE) or []
+        for entry in sorted(index, key=lambda e: e.get('last_access', 0)):
+            url = entry.get('url')
+            if url and os.path.exists(os.path.join(self.directory, entry.get('file', ''))):
+                self.entries[url] = entry
+        logger.debug(f"Disk image cache has {len(self.entries)} entries ({self.total_bytes()} bytes)")
+
+    def _schedule_save(self):
+        """Save the index soon on a timer thread, batching changes made until then.
+
+        Call with the lock held.
+        """
+        if self._save_timer is None:
+            self._save_timer = threading.Timer(INDEX_SAVE_DELAY, self.flush)
+            self._save_timer.daemon = True
+            self._save_timer.start()
+
+    def flush(self):
+        """Write pending index changes now"""
+        with self._lock:
+            if self._save_timer is None:
+                return
+            self._save_timer.cancel()
+            self._save_timer = None
+            # Copy under the lock, the write happens outside it
+            index = [dict(entry) for entry in self.entries.values()]
+        cache.write_json(INDEX_FILE, index)
+
+    @staticmethod
+    def _file_name(url: str) -> str:
+        return hashlib.sha1(url.encode('utf-8')).hexdigest()
+
+    def total_bytes(self) -> int:
+        return sum(entry.get('size', 0) for entry in self.entries.values())
+
+    def __contains__(self, url: str) -> bool:
+        return url in self.entries
+
+    def get(self, url: str) -> Optional[bytes]:
+        """Get the cached bytes for a URL, or None on a miss"""
+        with self._lock:
+            entry = self.entries.get(url)
+            if entry is None:
+                return None
+            try:
+                with open(os.path.join(self.directory, entry['file']), 'rb') as f:
+                    data = f.read()
+            except OSError as e:
+                logger.warning(f"Dropping unreadable cached image for {url}: {str(e)}")
+                del self.entries[url]
+                self._schedule_save()
+                return None
+            entry['last_access'] = time.time()
+            self.entries.move_to_end(url)
+            self._schedule_save()
+            return data
+
+    def validators(self, url: str) -> Dict[str, str]:
+        """Get conditional request headers for a cached URL"""
+        entry = self.entries.get(url) or {}
+        headers = {}
+        if entry.get('etag'):
+            headers['If-None-Match'] = entry['etag']
+        if entry.get('last_modified'):
+            headers['If-Modified-Since'] = entry['last_modified']
+        return headers
+
+    def put(self, url: str, data: bytes, etag: str = None, last_modified: str = None):
+        """Store image bytes for a URL and evict old entries if over budget"""
+        with self._lock:
+            file_name = self._file_name(url)
+            path = cache.cache_path(IMAGE_CACHE_DIR, file_name)
+            try:
+                tmp_path = f"{path}.tmp"
+                with open(tmp_path, 'wb') as f:
+                    f.write(data)
+                os.replace(tmp_path, path)
+            except OSError as e:
+                logger.error(f"Error writing cached image for {url}: {str(e)}")
+                return
+            self.entries[url] = {
+                'url': url,
+                'file': file_name,
+                'size': len(data),
+                'etag': etag,
+                'last_modified': last_modified,
+                'last_access': time.time(),
+            }
+            self.entries.move_to_end(url)
+            self._evict()
+            self._schedule_save()
+
+    def touch(self, url: str):
+        """Mark a cached URL as fresh after a 304 Not Modified response"""
+        with self._lock:
+            entry = self.entries.get(url)
+            if entry is None:
+                return
+            entry['last_access'] = time.time()
+            self.entries.move_to_end(url)
+            self._schedule_save()
+
+    def _evict(self):
+        """Remove least recently used entries until the cache fits its budget"""
+        total = self.total_bytes()
+        while total > self.max_bytes and len(self.entries) > 1:
+            url, entry = self.entries.popitem(last=False)
+            total -= entry.get('size', 0)
+            try:
+                os.unlink(os.path.join(self.directory, entry['file']))
+            except OSError:
+                pass
+            logger.debug(f"Evicted cached image {url}")
@@ -1,10 +1,22 @@
-from bs4 import BeautifulSoup
+import hashlib
+import json
+import os
 import logging
 
+from src.data import cache
+
 # Set up logging
 logging.basicConfig(level=logging.DEBUG)
 logger = logging.getLogger(__name__)
 
+HTML_FILE = 'src/data/img_url_hack.html'
+# Pre-parsed URL pairs, regenerated whenever the HTML file's content hash changes
+MANIFEST_FILE = 'src/data/img_url_manifest.json'
+MANIFEST_VERSION = 2
+# Size and mtime of the HTML file the manifest hash was last checked against. Kept in
+# the user cache, file timestamps differ between checkouts so they can't be committed
+MANIFEST_STAMP_FILE = 'img_url_manifest_stamp.json'
+
 
 def extract_google_urls(html_content):
     """
@@ -16,6 +28,9 @@ def extract_google_urls(html_content):
     Returns:
         list: List of found googleusercontent.com URLs
     """
+    # Imported lazily, it is only needed when the manifest has to be rebuilt
+    from bs4 import BeautifulSoup
+
     soup = BeautifulSoup(html_content, 'html.parser')
     
     # Find all elements that might contain URLs
@@ -36,17 +51,89 @@ def extract_google_urls(html_content):
     
     return urls
 
-def get_champion_urls():
-    # Read the HTML file
-    with open('src/data/img_url_hack.html', 'r', encoding='utf-8') as f:
-        html_content = f.read()
+def _hash_bytes(data):
+    """Return the SHA-256 hex digest of the given bytes."""
+    return hashlib.sha256(data).hexdigest()
+
+def _file_stamp(stat, source_hash):
+    return {'source_sha256': source_hash, 'source_size': stat.st_size, 'source_mtime_ns': stat.st_mtime_ns}
+
+def build_manifest(html_path=HTML_FILE, manifest_path=MANIFEST_FILE):
+    """
+    Parse the HTML file and write the URL manifest next to it.
+    
+    Returns:
+        dict: The manifest that was written
+    """
+    with open(html_path, 'rb') as f:
+        raw = f.read()
+    stat = os.stat(html_path)
+    source_hash = _hash_bytes(raw)
     
     # Extract URLs
-    urls = extract_google_urls(html_content)
+    urls = extract_google_urls(raw.decode('utf-8'))
     
     # Pair every two urls
     paired_urls = [urls[i:i+2] for i in range(0, len(urls), 2)]
+    
+    manifest = {
+        'version': MANIFEST_VERSION,
+        'source_sha256': source_hash,
+        'champion_urls': paired_urls,
+    }
+    _write_manifest(manifest, manifest_path)
+    cache.write_json(MANIFEST_STAMP_FILE, _file_stamp(stat, source_hash))
+    logger.info(f"Built image URL manifest with {len(paired_urls)} entries")
+    return manifest
+
+def _write_manifest(manifest, manifest_path):
+    """Write the manifest, logging instead of failing if the location is read-only."""
+    try:
+        with open(manifest_path, 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, indent=1)
+    except OSError as e:
+        logger.warning(f"Could not write image URL manifest {manifest_path}: {e}")
 
+def load_manifest(html_path=HTML_FILE, manifest_path=MANIFEST_FILE):
+    """
+    Load the URL pairs from the manifest if it still matches the HTML file.
+    
+    The file size and mtime are checked against the stamp in the user cache
+    first; the content hash is only computed when they differ (e.g. on the
+    first run after a checkout). The manifest itself is never rewritten here.
+    
+    Returns:
+        list: The paired URLs, or None if the manifest is missing or stale
+    """
+    try:
+        with open(manifest_path, 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+        stat = os.stat(html_path)
+    except (OSError, ValueError):
+        return None
+    
+    if manifest.get('version') != MANIFEST_VERSION:
+        return None
+    
+    stamp = cache.read_json(MANIFEST_STAMP_FILE) or {}
+    if stamp == _file_stamp(stat, manifest.get('source_sha256')):
+        return manifest['champion_urls']
+    
+    with open(html_path, 'rb') as f:
+        source_hash = _hash_bytes(f.read())
+    if source_hash != manifest.get('source_sha256'):
+        logger.info("Image URL manifest is stale, HTML file changed")
+        return None
+    
+    # Same content, remember the timestamp to skip hashing next time
+    cache.write_json(MANIFEST_STAMP_FILE, _file_stamp(stat, source_hash))
+    return manifest['champion_urls']
+
+def get_champion_urls():
+    """Get the (runes, summoner spells) image URL pairs, in sheet order."""
+    paired_urls = load_manifest()
+    if paired_urls is None:
+        paired_urls = build_manifest()['champion_urls']
     return paired_urls
 
 if __name__ == '__main__':
@@ -0,0 +1,131 @@
+"""
+Columnar view of the Matchups sheet, built once per sheet load.
+"""
+from array import array
+from enum import IntEnum
+from typing import Dict, List, Sequence
+
+from src.data.champion_index import ChampionIndex
+from src.data.gameplay_parser import empty_sections, parse_gameplay_batch
+
+# Sheet columns, zero based
+DIFFICULTY_COLUMN = 2  # C
+OVERVIEW_COLUMN = 3  # D
+GAMEPLAY_COLUMN = 4  # E
+# The difficulty sits two rows below the champion name in the sheet layout
+DIFFICULTY_ROW_OFFSET = 2
+
+
+class Difficulty(IntEnum):
+    """Matchup difficulty parsed from the sheet, OTHER for text outside the scale"""
+    UNKNOWN = 0
+    EASY = 1
+    MEDIUM = 2
+    HARD = 3
+    VERY_HARD = 4
+    OTHER = 5
+
+    @property
+    def label(self) -> str:
+        return self.name.replace('_', ' ').title()
+
+    @classmethod
+    def parse(cls, text: str) -> 'Difficulty':
+        if not text or not text.strip():
+            return cls.UNKNOWN
+        return _DIFFICULTY_BY_KEY.get(_difficulty_key(text), cls.OTHER)
+
+
+def _difficulty_key(text: str) -> str:
+    return ''.join(char for char in text.lower() if char.isalnum())
+
+
+_DIFFICULTY_BY_KEY = {
+    _difficulty_key(difficulty.label): difficulty
+    for difficulty in Difficulty if difficulty is not Difficulty.OTHER
+}
+
+
+def _cell(values: List[List[str]], row_idx: int, column: int) -> str:
+    if 0 <= row_idx < len(values):
+        row = values[row_idx]
+        if len(row) > column and row[column]:
+            return row[column]
+    return ""
+
+
+class MatchupTable:
+    """One column per matchup field, indexed by the champion's position in the sheet."""
+
+    def __init__(self, champions: List[str], rows: Sequence[int], overviews: List[str],
+                 gameplay: List[str], difficulty_text: List[str], image_urls: List[List[str]]):
+        self.champions = champions
+        self.rows = array('i', rows)
+        self.overviews = overviews
+        self.gameplay = gameplay
+        self.sections = parse_gameplay_batch(gameplay)
+        self.difficulties = array('B', (Difficulty.parse(text) for text in difficulty_text))
+        # The sheet's own spelling is what gets displayed
+        self.difficulty_text = difficulty_text
+        #TODO: Runes and summoner spells still come from the image hack, by position
+        self.runes = [urls[0] if len(urls) > 0 else "" for urls in image_urls[:len(champions)]]
+        self.summoner_spells = [urls[1] if len(urls) > 1 else "" for urls in image_urls[:len(champions)]]
+        self.runes += [""] * (len(champions) - len(self.runes))
+        self.summoner_spells += [""] * (len(champions) - len(self.summoner_spells))
+        self.index = ChampionIndex((champion, position) for position, champion in enumerate(champions))
+
+    @classmethod
+    def from_values(cls, values: List[List[str]], champions_list: List[str],
+                    champion_to_row: Dict[str, int], image_urls: List[List[str]]) -> 'MatchupTable':
+        """Ingest the raw sheet values for the given champions in a single pass"""
+        rows = [champion_to_row.get(champion.lower(), -1) for champion in champions_list]
+        return cls(
+            champions=list(champions_list),
+            rows=rows,
+            overviews=[_cell(values, row, OVERVIEW_COLUMN) for row in rows],
+            gameplay=[_cell(values, row, GAMEPLAY_COLUMN) for row in rows],
+            difficulty_text=[
+                _cell(values, row + DIFFICULTY_ROW_OFFSET, DIFFICULTY_COLUMN) if row >= 0 else ""
+                for row in rows
+            ],
+            image_urls=image_urls or [],
+        )
+
+    @classmethod
+    def empty(cls) -> 'MatchupTable':
+        return cls([], [], [], [], [], [])
+
+    def __len__(self):
+        return len(self.champions)
+
+    def position(self, champion: str) -> int:
+        """Get the champion's position in the table, or -1 if it isn't there"""
+        position = self.index.get(champion)
+        return -1 if position is None else position
+
+    def row(self, position: int) -> int:
+        return self.rows[position] if position >= 0 else -1
+
+    def overview(self, position: int) -> str:
+        return self.overviews[position] if position >= 0 else ""
+
+    def gameplay_text(self, position: int) -> str:
+        return self.gameplay[position] if position >= 0 else ""
+
+    def gameplay_sections(self, position: int) -> Dict[str, str]:
+        """Get the parsed gameplay sections; callers get their own copy"""
+        return dict(self.sections[position]) if position >= 0 else empty_sections()
+
+    def difficulty(self, position: int) -> Difficulty:
+        return Difficulty(self.difficulties[position]) if position >= 0 else Difficulty.UNKNOWN
+
+    def difficulty_label(self, position: int) -> str:
+        """Get the difficulty as written in the sheet, or "Unknown" if the cell is empty"""
+        text = self.difficulty_text[position] if position >= 0 else ""
+        return text or Difficulty.UNKNOWN.label
+
+    def rune(self, position: int) -> str:
+        return self.runes[position] if position >= 0 else ""
+
+    def summoner_spell(self, position: int) -> str:
+        return self.summoner_spells[position] if position >= 0 else ""
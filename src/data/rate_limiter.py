@@ -0,0 +1,88 @@
+"""
+Client-side request throttling and retry policy for Google API calls.
+"""
+import asyncio
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from typing import Optional
+
+
+class TokenBucket:
+    """Allow short bursts of requests while keeping the average under a quota.
+
+    Tokens refill continuously at ``rate`` per second up to ``capacity``.
+    Each request takes one token; when none are left the caller waits until
+    its token has refilled. Safe to share between threads and the event loop.
+    """
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    @classmethod
+    def per_minute(cls, requests_per_minute: float, burst: float) -> 'TokenBucket':
+        return cls(requests_per_minute / 60.0, burst)
+
+    def _reserve(self) -> float:
+        """Take a token, returning how long to wait before using it"""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= 1
+            if self._tokens >= 0:
+                return 0.0
+            # The token is borrowed from the future, later callers queue behind it
+            return -self._tokens / self.rate
+
+    def acquire(self):
+        wait = self._reserve()
+        if wait > 0:
+            time.sleep(wait)
+
+    async def acquire_async(self):
+        wait = self._reserve()
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+
+class RetryPolicy:
+    """Jittered exponential backoff for throttled and failed requests."""
+
+    RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+    def __init__(self, max_attempts: int = 5, initial_delay: float = 1, max_delay: float = 32):
+        self.max_attempts = max_attempts
+        self.initial_delay = initial_delay
+        self.max_delay = max_delay
+
+    def should_retry(self, status: int, attempt: int) -> bool:
+        """Check whether a response status is worth retrying after the given attempt (0 based)"""
+        return status in self.RETRY_STATUSES and attempt < self.max_attempts - 1
+
+    def delay(self, attempt: int, retry_after: Optional[str] = None) -> float:
+        """Get the wait before the next attempt, honoring a Retry-After header if present"""
+        server_delay = self.parse_retry_after(retry_after)
+        if server_delay is not None:
+            return min(server_delay, self.max_delay)
+        # Full jitter keeps clients that failed together from retrying together
+        return random.uniform(0, min(self.max_delay, self.initial_delay * (2 ** attempt)))
+
+    @staticmethod
+    def parse_retry_after(value: Optional[str]) -> Optional[float]:
+        """Parse a Retry-After header given either in seconds or as an HTTP date"""
+        if not value:
+            return None
+        try:
+            return max(0.0, float(value))
+        except ValueError:
+            pass
+        try:
+            return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+        except (TypeError, ValueError):
+            return None
@@ -0,0 +1,44 @@
+"""
+Build Google API clients once per credentials from the bundled discovery documents.
+"""
+import threading
+import time
+
+from src.logger import logger
+
+# (api, version, id(credentials)) -> (credentials, service)
+_services = {}
+_services_lock = threading.Lock()
+
+
+def get_service(api: str, version: str, credentials):
+    """Get an API client for the credentials, building it on first use.
+
+    Clients are built from the discovery documents shipped with
+    googleapiclient, so construction never waits on the network.
+    """
+    key = (api, version, id(credentials))
+    with _services_lock:
+        cached = _services.get(key)
+        # Compare identity too, an id can be reused once credentials are collected
+        if cached is not None and cached[0] is credentials:
+            return cached[1]
+
+        start = time.perf_counter()
+        # Imported on first use, the discovery module pulls in most of the client library
+        import googleapiclient.discovery
+        service = googleapiclient.discovery.build(
+            api, version,
+            credentials=credentials,
+            static_discovery=True,
+            cache_discovery=False
+        )
+        logger.info(f"Built {api} {version} client in {(time.perf_counter() - start) * 1000:.1f} ms")
+        _services[key] = (credentials, service)
+        return service
+
+
+def clear_services():
+    """Drop all cached clients, e.g. after signing in again"""
+    with _services_lock:
+        _services.clear()
@@ -1,4 +1,7 @@
-from typing import List
+import hashlib
+from collections.abc import Mapping
+from functools import partial
+from typing import TYPE_CHECKING, Callable, Iterable, List
 import os
 import sys
 
@@ -6,133 +9,159 @@ import sys
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from src.champion_matchup import ChampionMatchup
-from src.data.google_sheets_manager import GoogleSheetsManager
-from src.data.image_hack import get_champion_urls
+from src.data.champion_index import ChampionIndex
+from src.data.matchup_table import Difficulty, MatchupTable
 from src.logger import logger
 import asyncio
 
+if TYPE_CHECKING:
+    from src.data.google_sheets_manager import GoogleSheetsManager
+
+# Used when the sheet can't be loaded at all
+FALLBACK_CHAMPIONS = [
+    "Aatrox", "Camille", "Darius", "Dr. Mundo", "Fiora", "Gangplank", "Garen", 
+    "Gnar", "Gwen", "Illaoi", "Irelia", "Jax", "Jayce", "Kayle", "Kennen", 
+    "Kled", "Malphite", "Mordekaiser", "Nasus", "Ornn", "Pantheon", "Quinn", 
+    "Renekton", "Riven", "Sett", "Shen", "Singed", "Sion", "Teemo", "Tryndamere", 
+    "Urgot", "Vayne", "Vladimir", "Volibear", "Wukong", "Yorick"
+]
+
+class MatchupMap(Mapping):
+    """Champion name to ChampionMatchup, parsing each matchup on first access.
+
+    The champion list is available immediately. Lookups accept any spelling
+    the champion index folds to the same key, e.g. "kai'sa" or "MonkeyKing".
+    """
+
+    def __init__(self, champions: Iterable[str], build: Callable[[str], ChampionMatchup]):
+        self.champions = list(dict.fromkeys(champions))
+        self._build = build
+        self._index = ChampionIndex((champion, champion) for champion in self.champions)
+        self._matchups = {}
+
+    def __getitem__(self, champion: str) -> ChampionMatchup:
+        name = self._index.get(champion)
+        if name is None:
+            raise KeyError(champion)
+        matchup = self._matchups.get(name)
+        if matchup is None:
+            matchup = self._matchups[name] = self._build(name)
+        return matchup
+
+    def __contains__(self, champion) -> bool:
+        return isinstance(champion, str) and champion in self._index
+
+    def __iter__(self):
+        return iter(self.champions)
+
+    def __len__(self):
+        return len(self.champions)
+
 class MatchupLoader:
-    def __init__(self):
-        """Initialize the MatchupLoader with a GoogleSheetsManager instance."""
-        self.sheets_manager = GoogleSheetsManager(os.getenv('SHEET_ID'))
-        self.champion_urls = get_champion_urls()
+    def __init__(self, sheets_manager: 'GoogleSheetsManager' = None):
+        """Initialize the MatchupLoader with a GoogleSheetsManager instance.
+
+        Args:
+            sheets_manager: Manager to read from, defaults to the shared instance
+        """
+        if sheets_manager is None:
+            # Imported here so the Google API stack only loads when it is needed
+            from src.data.google_sheets_manager import get_shared_manager
+            sheets_manager = get_shared_manager(os.getenv('SHEET_ID'))
+        self.sheets_manager = sheets_manager
     
-    async def load_matchups(self) -> List[ChampionMatchup]:
-        """Load all champion matchups from the Google Sheet."""
+    async def load_matchup_map(self) -> 'MatchupMap':
+        """Load the champion list, deferring each matchup until it is first used."""
         try:
-            matchups = []
-            champions = self.sheets_manager.get_all_champions()
+            # Load the sheet off the event loop if it isn't cached yet
+            await self.sheets_manager.ensure_data_async()
+            # Bind the map to one version of the sheet so a refresh can't mix old and new rows
+            table = self.sheets_manager.matchup_table
+            champions = list(table.champions)
             logger.info(f"Retrieved {len(champions)} champions from GoogleSheetsManager")
             
             if not champions:
                 logger.warning("No champions found, using fallback champion list")
                 # Create fallback champion list if Google Sheets fails
-                champions = [
-                    "Aatrox", "Camille", "Darius", "Dr. Mundo", "Fiora", "Gangplank", "Garen", 
-                    "Gnar", "Gwen", "Illaoi", "Irelia", "Jax", "Jayce", "Kayle", "Kennen", 
-                    "Kled", "Malphite", "Mordekaiser", "Nasus", "Ornn", "Pantheon", "Quinn", 
-                    "Renekton", "Riven", "Sett", "Shen", "Singed", "Sion", "Teemo", "Tryndamere", 
-                    "Urgot", "Vayne", "Vladimir", "Volibear", "Wukong", "Yorick"
-                ]
-            
-            for champion in champions:
-                try:
-                    logger.debug(f"Loading matchup data for {champion}")
-                    
-                    # Create a dummy difficulty string if actual one isn't available
-                    difficulty = "Unknown"
-                    try:
-                        difficulty = self.sheets_manager.get_matchup_difficulty(champion)
-                        if not difficulty or difficulty == "Unknown":
-                            # Assign a default difficulty based on the champion name
-                            import hashlib
-                            # Create a deterministic difficulty based on champion name
-                            hash_val = int(hashlib.md5(champion.encode()).hexdigest(), 16) % 4
-                            difficulty = ["Easy", "Medium", "Hard", "Very Hard"][hash_val]
-                            logger.debug(f"Generated default difficulty for {champion}: {difficulty}")
-                    except Exception as e:
-                        logger.error(f"Error getting difficulty for {champion}: {str(e)}", exc_info=True)
-                    
-                    # Use create_gameplay_dict to parse the text into sections
-                    try:
-                        gameplay_dict = self.sheets_manager.create_gameplay_dict(champion)
-                        logger.debug(f"Parsed sections for {champion}: {', '.join([k for k, v in gameplay_dict.items() if v])}")
-                    except Exception as e:
-                        logger.error(f"Error creating gameplay dict for {champion}: {str(e)}", exc_info=True)
-                        gameplay_dict = {
-                            "early_game": "",
-                            "how_to_trade": "",
-                            "what_to_watch_out_for": "",
-                            "tips": ""
-                        }
-                    
-                    # Get runes and summoner spell information
-                    runes = self.sheets_manager.get_champion_runes(champion) or []
-                    summoner_spell = self.sheets_manager.get_summoner_spells(champion) or []
-                    
-                    # Get image URLs for runes and summoner spells
-                    rune_image_url = ""
-                    summoner_spell_image_url = ""
-                    if champion in self.champion_urls and len(self.champion_urls[champion]) >= 2:
-                        rune_image_url = self.champion_urls[champion][0]
-                        summoner_spell_image_url = self.champion_urls[champion][1]
-                        logger.debug(f"Found image URLs for {champion}: runes={rune_image_url}, summoner={summoner_spell_image_url}")
-                    
-                    overview = ""
-                    try:
-                        overview = self.sheets_manager.get_matchup_tldr(champion)
-                    except Exception as e:
-                        logger.error(f"Error getting overview for {champion}: {str(e)}", exc_info=True)
-                    
-                    # Create the ChampionMatchup object with proper capitalization for properties
-                    matchup = ChampionMatchup(
-                        champion_name=champion,
-                        matchup_difficulty=difficulty or "Unknown",
-                        runes=runes,
-                        summoner_spell=summoner_spell,
-                        matchup_overview=overview or f"Matchup information for {champion} vs. Urgot",
-                        early_game=gameplay_dict['early_game'],
-                        how_to_trade=gameplay_dict['how_to_trade'],
-                        what_to_watch_out_for=gameplay_dict['what_to_watch_out_for'],
-                        tips=gameplay_dict['tips'],
-                        rune_image_url=rune_image_url,
-                        summoner_spell_image_url=summoner_spell_image_url
-                    )
-                    
-                    # Debug log the created matchup
-                    logger.info(f"Loaded matchup data for {champion}")
-                    logger.debug(f"Matchup data for {champion}: " + 
-                                f"difficulty={matchup.matchup_difficulty}, " +
-                                f"overview={matchup.matchup_overview[:30]}..., " +
-                                f"early_game={matchup.early_game[:30] if matchup.early_game else 'None'}...")
-                    
-                    matchups.append(matchup)
-                    
-                except Exception as e:
-                    logger.error(f"Error loading matchup for {champion}: {str(e)}", exc_info=True)
-                    # Create a minimal matchup object for champions that failed to load
-                    minimal_matchup = ChampionMatchup(
-                        champion_name=champion,
-                        matchup_difficulty="Unknown",
-                        runes="",
-                        summoner_spell="",
-                        matchup_overview=f"Error loading matchup information for {champion}.",
-                        early_game="",
-                        how_to_trade="",
-                        what_to_watch_out_for="",
-                        tips="",
-                        rune_image_url="",
-                        summoner_spell_image_url=""
-                    )
-                    matchups.append(minimal_matchup)
-                    continue
+                champions = FALLBACK_CHAMPIONS
             
-            logger.info(f"Successfully loaded {len(matchups)} matchups")
-            return matchups
+            return MatchupMap(champions, partial(self.build_matchup, table=table))
             
         except Exception as e:
             logger.error(f"Error loading matchups: {str(e)}", exc_info=True)
-            return []
+            return MatchupMap([], self.build_matchup)
+
+    async def load_matchups(self) -> List[ChampionMatchup]:
+        """Load all champion matchups from the Google Sheet."""
+        matchups = list((await self.load_matchup_map()).values())
+        logger.info(f"Successfully loaded {len(matchups)} matchups")
+        return matchups
+
+    def build_matchup(self, champion: str, table: MatchupTable = None) -> ChampionMatchup:
+        """Parse the matchup for one champion from the cached sheet data.
+
+        Args:
+            champion: Champion name, any spelling the champion index accepts
+            table: Sheet version to read, defaults to the manager's current one
+        """
+        try:
+            logger.debug(f"Loading matchup data for {champion}")
+            # Every field was parsed when the sheet loaded, this only reads columns
+            if table is None:
+                table = self.sheets_manager.matchup_table
+            position = table.position(champion)
+
+            difficulty = table.difficulty_label(position)
+            if difficulty == Difficulty.UNKNOWN.label:
+                # Create a deterministic difficulty based on champion name
+                hash_val = int(hashlib.md5(champion.encode()).hexdigest(), 16) % 4
+                difficulty = ["Easy", "Medium", "Hard", "Very Hard"][hash_val]
+                logger.debug(f"Generated default difficulty for {champion}: {difficulty}")
+
+            gameplay_dict = table.gameplay_sections(position)
+            runes = table.rune(position)
+            summoner_spell = table.summoner_spell(position)
+            overview = table.overview(position)
+
+            # Create the ChampionMatchup object with proper capitalization for properties
+            matchup = ChampionMatchup(
+                champion_name=champion,
+                matchup_difficulty=difficulty or "Unknown",
+                runes=runes,
+                summoner_spell=summoner_spell,
+                matchup_overview=overview or f"Matchup information for {champion} vs. Urgot",
+                early_game=gameplay_dict['early_game'],
+                how_to_trade=gameplay_dict['how_to_trade'],
+                what_to_watch_out_for=gameplay_dict['what_to_watch_out_for'],
+                tips=gameplay_dict['tips']
+            )
+
+            # Debug log the created matchup
+            logger.info(f"Loaded matchup data for {champion}")
+            logger.debug(f"Matchup data for {champion}: " + 
+                        f"difficulty={matchup.matchup_difficulty}, " +
+                        f"overview={matchup.matchup_overview[:30]}..., " +
+                        f"early_game={matchup.early_game[:30] if matchup.early_game else 'None'}...")
+
+            return matchup
+
+        except Exception as e:
+            logger.error(f"Error loading matchup for {champion}: {str(e)}", exc_info=True)
+            # Create a minimal matchup object for champions that failed to load
+            minimal_matchup = ChampionMatchup(
+                champion_name=champion,
+                matchup_difficulty="Unknown",
+                runes="",
+                summoner_spell="",
+                matchup_overview=f"Error loading matchup information for {champion}.",
+                early_game="",
+                how_to_trade="",
+                what_to_watch_out_for="",
+                tips="",
+                rune_image_url="",
+                summoner_spell_image_url=""
+            )
+            return minimal_matchup
 
 async def test_matchup_loader():
     """Test function to demonstrate the usage of MatchupLoader."""
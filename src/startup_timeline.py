@@ -0,0 +1,166 @@
+"""
+Startup timeline with monotonic timestamps and per-phase durations.
+
+Everything is written to startup_log.txt through one buffered file handle,
+so instrumenting startup doesn't add file opens to the path being measured.
+The log is only opened by the application run itself (see open_log), so
+importing main.py, e.g. to time imports, leaves the user's log alone.
+"""
+import threading
+import time
+from typing import Dict, List, Optional
+
+STARTUP_LOG_FILE = "startup_log.txt"
+STARTUP_PROFILE_FILE = "startup.prof"
+PROFILE_STARTUP_FLAG = "--profile-startup"
+
+# Phases that make up a complete startup, in the order they usually start
+QAPPLICATION_PHASE = "QApplication creation"
+CREDENTIAL_CHECK_PHASE = "credential check"
+SHEETS_MANAGER_PHASE = "GoogleSheetsManager init"
+SHEET_LOAD_PHASE = "sheet load"
+LEAGUE_CLIENT_PHASE = "LeagueClient discovery"
+FIRST_PAINT_PHASE = "first paint"
+STARTUP_PHASES = (
+    QAPPLICATION_PHASE,
+    CREDENTIAL_CHECK_PHASE,
+    SHEETS_MANAGER_PHASE,
+    SHEET_LOAD_PHASE,
+    LEAGUE_CLIENT_PHASE,
+    FIRST_PAINT_PHASE,
+)
+
+
+class StartupTimeline:
+    """Record when each startup phase starts and ends.
+
+    Only the first run of a phase is recorded, so code paths that repeat
+    later (e.g. sheet refreshes) can be instrumented unconditionally.
+    Once every expected phase has ended the summary is written and the
+    profiler, if any, is stopped.
+    """
+
+    def __init__(self, path: str = STARTUP_LOG_FILE, expected_phases=STARTUP_PHASES):
+        self.path = path
+        self.expected_phases = tuple(expected_phases)
+        self.origin = time.perf_counter()
+        self.phases: Dict[str, List[Optional[float]]] = {}
+        self.completed = False
+        # None until open_log, False once closed or if it couldn't be opened
+        self._file = None
+        self._pending: List[str] = []
+        self._lock = threading.Lock()
+        self._profiler = None
+        self._profile_path = None
+
+    def elapsed_ms(self) -> float:
+        return (time.perf_counter() - self.origin) * 1000
+
+    def open_log(self):
+        """Start writing to the log file, including the lines logged so far"""
+        with self._lock:
+            if self._file is not None:
+                return
+            try:
+                # Truncate, the log only covers the current run
+                self._file = open(self.path, "w", encoding="utf-8")
+            except OSError as e:
+                print(f"Failed to open startup log: {str(e)}")
+                self._file = False
+                return
+            self._file.writelines(self._pending)
+            self._pending.clear()
+
+    def log(self, message: str):
+        """Write a timestamped line to the startup log, held in memory until open_log"""
+        line = f"[{self.elapsed_ms():9.1f} ms] {message.rstrip()}\n"
+        with self._lock:
+            if self._file is None:
+                self._pending.append(line)
+            elif self._file:
+                self._file.write(line)
+
+    def start(self, phase: str):
+        with self._lock:
+            if phase in self.phases:
+                return
+            self.phases[phase] = [time.perf_counter(), None]
+        self.log(f"{phase} started")
+
+    def end(self, phase: str):
+        with self._lock:
+            times = self.phases.get(phase)
+            if times is None or times[1] is not None:
+                return
+            times[1] = time.perf_counter()
+            completed = not self.completed and all(
+                self.phases.get(name, (None, None))[1] is not None for name in self.expected_phases
+            )
+            if completed:
+                self.completed = True
+        self.log(f"{phase} finished in {(times[1] - times[0]) * 1000:.1f} ms")
+        if completed:
+            self._complete()
+
+    def summary(self) -> str:
+        """Format the recorded phases ordered by start time"""
+        lines = [f"Startup timeline ({self.elapsed_ms():.1f} ms since start):"]
+        for phase, (start, end) in sorted(self.phases.items(), key=lambda item: item[1][0]):
+            start_ms = (start - self.origin) * 1000
+            if end is None:
+                lines.append(f"  {phase:<26} at {start_ms:9.1f} ms, did not finish")
+            else:
+                lines.append(f"  {phase:<26} at {start_ms:9.1f} ms, took {(end - start) * 1000:9.1f} ms")
+        for phase in self.expected_phases:
+            if phase not in self.phases:
+                lines.append(f"  {phase:<26} not reached")
+        return "\n".join(lines)
+
+    def _complete(self):
+        self.log(self.summary())
+        self.stop_profiling()
+        self.flush()
+
+    def start_profiling(self, path: str = STARTUP_PROFILE_FILE):
+        """Profile the calling thread with cProfile until startup completes.
+
+        The output is a pstats file, open it with snakeviz, flameprof or
+        `python -m pstats`.
+        """
+        import cProfile
+        self._profile_path = path
+        self._profiler = cProfile.Profile()
+        self._profiler.enable()
+        self.log(f"Profiling startup to {path}")
+
+    def stop_profiling(self):
+        if self._profiler is None:
+            return
+        profiler, self._profiler = self._profiler, None
+        profiler.disable()
+        try:
+            profiler.dump_stats(self._profile_path)
+            self.log(f"Wrote startup profile to {self._profile_path}")
+        except OSError as e:
+            self.log(f"Failed to write startup profile: {str(e)}")
+
+    def flush(self):
+        with self._lock:
+            if self._file:
+                self._file.flush()
+
+    def close(self):
+        """Write out anything still pending, e.g. when startup never completed"""
+        if not self.completed:
+            self.completed = True
+            self.log(self.summary())
+        self.stop_profiling()
+        with self._lock:
+            if self._file:
+                self._file.close()
+            # Don't reopen, and truncate, the log on a late write
+            self._file = False
+
+
+# Shared by main.py and the main window
+timeline = StartupTimeline()
@@ -0,0 +1,167 @@
+from collections import OrderedDict
+from PyQt6.QtCore import QObject, QRunnable, QThreadPool, QSize, Qt, pyqtSignal
+from PyQt6.QtGui import QImage, QPixmap
+from PyQt6 import sip
+from src.logger import logger
+
+# Worker threads used for decoding, kept small so the GUI thread isn't starved
+DECODE_THREADS = 2
+# Memory budget for scaled pixmaps. The lobby prefetch warms a portrait and a
+# summoner spell variant for every champion in the sheet, about 15MB, and the
+# cards on screen need room on top of that
+MAX_SCALED_CACHE_BYTES = 48 * 1024 * 1024
+# Prefetch decodes yield to images that a visible label is waiting for
+PREFETCH_PRIORITY = -1
+
+class DecodeSignals(QObject):
+    """Signals emitted by decode workers, delivered on the GUI thread"""
+    decoded = pyqtSignal(str, QSize, QImage, int)
+
+class ImageDecodeTask(QRunnable):
+    """Decode image bytes and scale them to a target size on a worker thread
+
+    ``data`` is either the image bytes or a callable returning them (or None),
+    so disk reads can happen on the worker as well. ``generation`` is passed
+    back with the result so superseded decodes can be told apart.
+    """
+
+    def __init__(self, image_url, data, size, signals, generation=0):
+        super().__init__()
+        self.image_url = image_url
+        self.data = data
+        self.size = QSize(size)
+        self.signals = signals
+        self.generation = generation
+
+    def run(self):
+        data = self.data() if callable(self.data) else self.data
+        image = QImage.fromData(data) if data else QImage()
+        if not image.isNull():
+            image = image.scaled(
+                self.size,
+                Qt.AspectRatioMode.KeepAspectRatio,
+                Qt.TransformationMode.SmoothTransformation
+            )
+        self.signals.decoded.emit(self.image_url, self.size, image, self.generation)
+
+class ImagePipeline(QObject):
+    """Decode and pre-scale images off the GUI thread, caching the scaled results.
+
+    The GUI thread only converts the finished QImage to a QPixmap and calls setPixmap.
+    """
+
+    def __init__(self, max_bytes=MAX_SCALED_CACHE_BYTES):
+        super().__init__()
+        self.max_bytes = max_bytes
+        self.cached_bytes = 0
+        self.pool = QThreadPool()
+        self.pool.setMaxThreadCount(DECODE_THREADS)
+        self.signals = DecodeSignals()
+        self.signals.decoded.connect(self._on_decoded)
+        # (url, width, height) -> scaled QPixmap, oldest first
+        self.scaled_cache = OrderedDict()
+        # (url, width, height) -> labels waiting for that variant
+        self.waiting = {}
+        # (url, width, height) -> generation of the latest decode, bumped on replace
+        self.generations = {}
+
+    @staticmethod
+    def _key(image_url, size):
+        return (image_url, size.width(), size.height())
+
+    @staticmethod
+    def _pixmap_bytes(pixmap):
+        return pixmap.width() * pixmap.height() * max(pixmap.depth(), 8) // 8
+
+    def _cache_pixmap(self, key, pixmap):
+        """Store a pixmap, evicting the least recently used ones over the budget"""
+        previous = self.scaled_cache.pop(key, None)
+        if previous is not None:
+            self.cached_bytes -= self._pixmap_bytes(previous)
+        self.scaled_cache[key] = pixmap
+        self.cached_bytes += self._pixmap_bytes(pixmap)
+        while self.cached_bytes > self.max_bytes and len(self.scaled_cache) > 1:
+            _, evicted = self.scaled_cache.popitem(last=False)
+            self.cached_bytes -= self._pixmap_bytes(evicted)
+
+    def cached(self, image_url, size):
+        """Get the cached pixmap for a URL at the given size, if there is one"""
+        key = self._key(image_url, size)
+        pixmap = self.scaled_cache.get(key)
+        if pixmap is not None:
+            self.scaled_cache.move_to_end(key)
+        return pixmap
+
+    def request(self, label, image_url, data, replace=False):
+        """Show image bytes on a label once they are decoded and scaled to its size
+
+        Args:
+            replace: Drop any cached variant first, e.g. when the image changed
+        """
+        size = label.size()
+        key = self._key(image_url, size)
+        pending = key in self.waiting
+        if replace:
+            previous = self.scaled_cache.pop(key, None)
+            if previous is not None:
+                self.cached_bytes -= self._pixmap_bytes(previous)
+            # Decode the new data even if a decode is pending, its result is stale
+            self.generations[key] = self.generations.get(key, 0) + 1
+            pending = False
+        else:
+            pixmap = self.cached(image_url, size)
+            if pixmap is not None:
+                self._set_label_pixmap(label, pixmap)
+                return
+
+        self.waiting.setdefault(key, []).append(label)
+        if not pending:
+            self.pool.start(ImageDecodeTask(image_url, data, size, self.signals, self.generations.get(key, 0)))
+
+    def warm(self, image_url, data, size):
+        """Decode and scale image bytes into the cache ahead of any label needing them
+
+        Args:
+            data: Image bytes, or a callable run on the worker that returns them
+        """
+        key = self._key(image_url, size)
+        if key in self.scaled_cache or key in self.waiting:
+            return
+        self.waiting[key] = []
+        task = ImageDecodeTask(image_url, data, size, self.signals, self.generations.get(key, 0))
+        self.pool.start(task, PREFETCH_PRIORITY)
+
+    def _on_decoded(self, image_url, size, image, generation):
+        """Cache a finished image and hand it to the labels waiting for it"""
+        key = self._key(image_url, size)
+        if generation != self.generations.get(key, 0):
+            # Replaced while decoding, the labels wait for the newer decode
+            logger.debug(f"Dropped superseded decode for URL: {image_url}")
+            return
+        labels = self.waiting.pop(key, [])
+        if image.isNull():
+            if labels:
+                logger.error(f"Failed to decode image data for URL: {image_url}")
+            else:
+                logger.debug(f"Skipped warming image for URL: {image_url}")
+            return
+
+        pixmap = QPixmap.fromImage(image)
+        self._cache_pixmap(key, pixmap)
+
+        for label in labels:
+            self._set_label_pixmap(label, pixmap)
+
+    @staticmethod
+    def _set_label_pixmap(label, pixmap):
+        if not label or sip.isdeleted(label):
+            logger.debug("Label no longer exists, skipping image display")
+            return
+        label.setPixmap(pixmap)
+        label.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        label.setMinimumSize(1, 1)  # Allow the label to shrink if needed
+
+    def clear(self):
+        """Drop all cached pixmaps"""
+        self.scaled_cache.clear()
+        self.cached_bytes = 0
@@ -1,12 +1,14 @@
+import os
+import asyncio
+import dataclasses
 from PyQt6.QtWidgets import QMainWindow, QVBoxLayout, QWidget, QLabel, QSystemTrayIcon, QMenu
-from PyQt6.QtCore import Qt, QTimer
+from PyQt6.QtCore import Qt, QTimer, pyqtSignal
 from PyQt6.QtGui import QIcon, QAction
 from .matchup_display import MatchupDisplay
 from .champion_selector import ChampionSelector
-from ..core.league_client import LeagueClient
-from ..data.google_sheets_manager import GoogleSheetsManager
 from qasync import asyncSlot
 from src.logger import logger
+from src.startup_timeline import timeline, SHEETS_MANAGER_PHASE, SHEET_LOAD_PHASE, LEAGUE_CLIENT_PHASE
 from src.matchup_loader import MatchupLoader
 from src.champion_matchup import ChampionMatchup
 from PyQt6.QtWidgets import QApplication
@@ -23,7 +25,26 @@ except ImportError:
             pass
         logger.error("Could not import LeagueClientError in main_window.py, using fallback")
 
+# Seconds between attempts to reconnect the League Client WebSocket
+EVENT_RECONNECT_DELAY = 5
+# Gameflow phases where matchup data and images are warmed before the cards are needed
+PREFETCH_PHASES = ("ReadyCheck", "ChampSelect")
+
+def _create_league_client():
+    """Import the LCU client and discover the running League Client, on a worker thread"""
+    from ..core.league_client import LeagueClient
+    return LeagueClient()
+
+def _create_sheets_manager():
+    """Import the Google API stack and create the shared sheet manager, on a worker thread"""
+    from ..data.google_sheets_manager import get_shared_manager
+    # Don't block on the network; load_sheet_data refreshes the data
+    return get_shared_manager(os.getenv('SHEET_ID'), background_refresh=False, blocking_load=False)
+
 class MainWindow(QMainWindow):
+    # Emitted from whichever thread loaded new sheet data, delivered on the GUI thread
+    sheet_data_changed = pyqtSignal()
+
     def __init__(self):
         super().__init__()
         self.setWindowTitle("Urgot Matchup Helper")
@@ -55,32 +76,23 @@ class MainWindow(QMainWindow):
         self.matchup_display = None
         self.check_timer = None
         self.update_timer = None
-        self.matchups = []  # Will store loaded matchups
+        self.matchups = {}  # Champion name -> matchup, parsed on first access
         self.manual_mode = False
         self.in_champion_select = False
         self.client_connected = False
+        self.events_connected = False
+        self.event_task = None
+        self.matchups_task = None
+        self.prefetch_started = False
+        self.dropdown_champions = None
+        self.sheet_data_changed.connect(self.on_sheet_data_changed)
         
-        # Create components safely
-        try:
-            self.league_client = LeagueClient()
-            self.client_connected = self.league_client.client_running
-            logger.info(f"League client connection status: {self.client_connected}")
-        except Exception as e:
-            logger.error(f"Error initializing LeagueClient: {str(e)}", exc_info=True)
-            self.league_client = None
-            self.client_connected = False
-        
-        try:
-            self.sheets_manager = GoogleSheetsManager()
-        except Exception as e:
-            logger.error(f"Error initializing GoogleSheetsManager: {str(e)}", exc_info=True)
-            self.sheets_manager = None
-        
-        try:
-            self.matchup_loader = MatchupLoader()
-        except Exception as e:
-            logger.error(f"Error initializing MatchupLoader: {str(e)}", exc_info=True)
-            self.matchup_loader = None
+        # The League Client and sheet components are created after the first paint,
+        # see connect_league_client and ensure_sheets_manager
+        self.league_client = None
+        self.sheets_manager = None
+        self.sheets_manager_task = None
+        self.matchup_loader = None
         
         # Set up UI
         try:
@@ -88,21 +100,15 @@ class MainWindow(QMainWindow):
         except Exception as e:
             logger.error(f"Error setting up UI: {str(e)}", exc_info=True)
             
-        # Set up timers
-        try:
-            self.setup_timers()
-        except Exception as e:
-            logger.error(f"Error setting up timers: {str(e)}", exc_info=True)
-        
         # Initial setup
         try:
-            if self.sheets_manager:
-                self.populate_champion_dropdown()
-                
-            if not self.client_connected:
-                self.show_client_connection_message()
-            else:
-                self.show_waiting_message()
+            self.show_waiting_message()
+            
+            # Connect to the client and load the sheet once the window is up;
+            # their dependencies are imported on worker threads. The polling
+            # timers start once the client connection attempt has finished
+            QTimer.singleShot(0, self.connect_league_client)
+            QTimer.singleShot(0, self.load_sheet_data)
         except Exception as e:
             logger.error(f"Error during initial setup: {str(e)}", exc_info=True)
             # Try to display an error message
@@ -115,6 +121,96 @@ class MainWindow(QMainWindow):
             except Exception:
                 pass
         
+    @asyncSlot()
+    async def connect_league_client(self):
+        """Discover the League Client off the GUI thread, then listen for its events"""
+        timeline.start(LEAGUE_CLIENT_PHASE)
+        try:
+            loop = asyncio.get_running_loop()
+            self.league_client = await loop.run_in_executor(None, _create_league_client)
+            self.client_connected = self.league_client.client_running
+            logger.info(f"League client connection status: {self.client_connected}")
+        except Exception as e:
+            logger.error(f"Error initializing LeagueClient: {str(e)}", exc_info=True)
+            self.league_client = None
+            self.client_connected = False
+        timeline.end(LEAGUE_CLIENT_PHASE)
+        
+        if not self.client_connected:
+            self.show_client_connection_message()
+            
+        # Prefer pushed client events, the timers remain as a fallback
+        try:
+            self.setup_timers()
+            if self.manual_mode:
+                # A champion picked from the dropdown meanwhile keeps polling paused
+                self.check_timer.stop()
+                self.update_timer.stop()
+        except Exception as e:
+            logger.error(f"Error setting up timers: {str(e)}", exc_info=True)
+        self.start_event_listener()
+
+    async def ensure_sheets_manager(self):
+        """Create the sheet manager and matchup loader on first use, off the GUI thread"""
+        if self.sheets_manager is None:
+            if self.sheets_manager_task is None or self.sheets_manager_task.done():
+                self.sheets_manager_task = asyncio.ensure_future(self._create_sheets_components())
+            await self.sheets_manager_task
+        return self.sheets_manager
+
+    async def _create_sheets_components(self):
+        timeline.start(SHEETS_MANAGER_PHASE)
+        try:
+            loop = asyncio.get_running_loop()
+            sheets_manager = await loop.run_in_executor(None, _create_sheets_manager)
+        except Exception as e:
+            logger.error(f"Error initializing GoogleSheetsManager: {str(e)}", exc_info=True)
+            return
+        finally:
+            timeline.end(SHEETS_MANAGER_PHASE)
+        
+        try:
+            # Share the sheet data instead of downloading it a second time
+            self.matchup_loader = MatchupLoader(sheets_manager)
+        except Exception as e:
+            logger.error(f"Error initializing MatchupLoader: {str(e)}", exc_info=True)
+            self.matchup_loader = None
+        
+        self.sheets_manager = sheets_manager
+        sheets_manager.add_data_listener(lambda data: self.sheet_data_changed.emit())
+        # Fill the dropdown right away from a snapshot, otherwise once the sheet has loaded
+        if sheets_manager.champions_list:
+            self.populate_champion_dropdown()
+
+    @asyncSlot()
+    async def load_sheet_data(self):
+        """Load or revalidate the sheet data without blocking the UI"""
+        try:
+            if not await self.ensure_sheets_manager():
+                return
+            # Only the first load is recorded, later calls are refreshes;
+            # new data reaches the window through sheet_data_changed
+            timeline.start(SHEET_LOAD_PHASE)
+            try:
+                await self.sheets_manager.refresh_data_async()
+            finally:
+                timeline.end(SHEET_LOAD_PHASE)
+            # Changed data repopulates the dropdown, this covers a failed first load
+            if self.dropdown_champions is None:
+                self.populate_champion_dropdown()
+        except Exception as e:
+            logger.error(f"Error loading sheet data: {str(e)}", exc_info=True)
+
+    def on_sheet_data_changed(self):
+        """Drop matchups parsed from the previous sheet data"""
+        logger.info("Sheet data changed, reloading matchups")
+        self.matchups = {}
+        self.matchups_task = None
+        self.prefetch_started = False
+        # Repopulating the dropdown changes its selection, only do it when the list changed
+        if self.sheets_manager and self.sheets_manager.champions_list != self.dropdown_champions:
+            self.populate_champion_dropdown()
+
     def setup_ui(self):
         """Set up the main UI components"""
         main_widget = QWidget()
@@ -212,29 +308,7 @@ class MainWindow(QMainWindow):
         try:
             # Try to get the gameflow phase
             phase = await self.league_client.get_gameflow_phase()
-            
-            # If we got here, we're connected to the client
-            if not self.client_connected:
-                self.client_connected = True
-                logger.info("Connected to League Client")
-                self.update_status_label("Connected to League Client")
-                
-            self.setWindowTitle(f"Urgot Matchup Helper - State: {phase if phase else 'Unknown'}")
-            
-            if phase == "ChampSelect":
-                self.in_champion_select = True
-                self.show()
-                self.raise_()
-                self.activateWindow()
-                self.update_timer.start(5000)
-                self.update_status_label("Champion Select Active")
-                await self.update_matchups()
-            else:
-                self.in_champion_select = False
-                if self.update_timer:
-                    self.update_timer.stop()
-                self.update_status_label(f"Current State: {phase if phase else 'Unknown'}")
-                self.show_waiting_message()
+            await self.handle_gameflow_phase(phase)
         except LeagueClientError as e:
             if "League Client is not running" in str(e):
                 # Specific handling for League Client not running
@@ -259,6 +333,107 @@ class MainWindow(QMainWindow):
             self.update_status_label(f"Error: {str(e)}", is_error=True)
             self.show_waiting_message()
 
+    async def handle_gameflow_phase(self, phase):
+        """React to a gameflow phase, whether polled or pushed by the client"""
+        if self.manual_mode:
+            return
+            
+        # If we got here, we're connected to the client
+        if not self.client_connected:
+            self.client_connected = True
+            logger.info("Connected to League Client")
+            self.update_status_label("Connected to League Client")
+            
+        self.setWindowTitle(f"Urgot Matchup Helper - State: {phase if phase else 'Unknown'}")
+        
+        # Start warming caches as soon as a game is found, once per lobby
+        if phase in PREFETCH_PHASES:
+            if not self.prefetch_started:
+                self.prefetch_started = True
+                asyncio.ensure_future(self.prefetch_matchups())
+        else:
+            self.prefetch_started = False
+        
+        if phase == "ChampSelect":
+            self.in_champion_select = True
+            self.show()
+            self.raise_()
+            self.activateWindow()
+            # Session events replace the update polling while the WebSocket is up
+            if not self.events_connected and self.update_timer:
+                self.update_timer.start(5000)
+            self.update_status_label("Champion Select Active")
+            await self.update_matchups()
+        else:
+            self.in_champion_select = False
+            if self.update_timer:
+                self.update_timer.stop()
+            self.update_status_label(f"Current State: {phase if phase else 'Unknown'}")
+            self.show_waiting_message()
+
+    def start_event_listener(self):
+        """Start listening for League Client WebSocket events"""
+        if self.league_client and self.event_task is None:
+            self.event_task = asyncio.ensure_future(self._run_event_listener())
+
+    def stop_event_listener(self):
+        """Stop the WebSocket listener task"""
+        if self.event_task:
+            self.event_task.cancel()
+            self.event_task = None
+
+    async def _run_event_listener(self):
+        """Keep a WebSocket subscription to the client, polling while it is unavailable"""
+        while True:
+            if self.league_client.client_running or await self.league_client.try_reconnect():
+                try:
+                    await self.league_client.listen_events(
+                        on_gameflow_phase=self.on_gameflow_phase_event,
+                        on_champ_select_session=self.on_champ_select_session_event,
+                        on_connected=self.on_events_connected
+                    )
+                except LeagueClientError as e:
+                    logger.debug(f"Event listener disconnected: {str(e)}")
+                self.on_events_disconnected()
+            await asyncio.sleep(EVENT_RECONNECT_DELAY)
+
+    async def on_events_connected(self):
+        """Switch from polling to pushed events once subscribed"""
+        self.events_connected = True
+        logger.info("Using League Client events, polling paused")
+        if self.check_timer:
+            self.check_timer.stop()
+        if self.update_timer:
+            self.update_timer.stop()
+        # Sync with the current state, events only report changes
+        await self.check_champion_select()
+
+    def on_events_disconnected(self):
+        """Fall back to polling when the WebSocket drops"""
+        if not self.events_connected:
+            return
+        self.events_connected = False
+        logger.info("League Client events unavailable, resuming polling")
+        if self.check_timer:
+            self.check_timer.start(2000)
+
+    async def on_gameflow_phase_event(self, phase):
+        """Handle a pushed gameflow phase change"""
+        if phase is None:
+            return
+        logger.debug(f"Gameflow phase event: {phase}")
+        await self.handle_gameflow_phase(phase)
+
+    async def on_champ_select_session_event(self, session):
+        """Handle a pushed champion select session update"""
+        if self.manual_mode or not session or not self.in_champion_select:
+            return
+        try:
+            enemy_champions = await self.league_client.resolve_enemy_champions(session)
+            await self.update_matchups(enemy_champions=enemy_champions)
+        except Exception as e:
+            logger.error(f"Error handling champion select event: {str(e)}", exc_info=True)
+
     def show_waiting_message(self):
         """Show the waiting message in the matchup display"""
         if not self.matchup_display:
@@ -266,9 +441,9 @@ class MainWindow(QMainWindow):
             return
             
         try:
-            self.matchup_display.clear_matchups()
-            self.matchup_display.add_matchup("Waiting for enemy champions...", 
-                                          "The app will update when champion select starts.")
+            self.matchup_display.set_matchups([
+                ("Waiting for enemy champions...", "The app will update when champion select starts.")
+            ])
             self.setWindowTitle("Urgot Matchup Helper - Waiting for Champion Select")
             if self.status_label:
                 self.update_status_label("Waiting for Champion Select")
@@ -282,33 +457,63 @@ class MainWindow(QMainWindow):
             return
             
         try:
-            self.matchup_display.clear_matchups()
-            self.matchup_display.add_matchup(
+            self.matchup_display.set_matchups([(
                 "Waiting for League Client...", 
                 "Please start the League of Legends client. This app will automatically connect when the client starts."
-            )
+            )])
             self.setWindowTitle("Urgot Matchup Helper - Waiting for League Client")
             if self.status_label:
                 self.update_status_label("WAITING FOR LEAGUE CLIENT CONNECTION", is_error=True)
         except Exception as e:
             logger.error(f"Error showing client connection message: {str(e)}", exc_info=True)
 
+    async def ensure_matchups(self):
+        """Load the matchups once, sharing the load between concurrent callers"""
+        if self.matchups:
+            return self.matchups
+        if not await self.ensure_sheets_manager() or not self.matchup_loader:
+            return self.matchups
+        if self.matchups_task is None or self.matchups_task.done():
+            self.matchups_task = asyncio.ensure_future(self.matchup_loader.load_matchup_map())
+        task = self.matchups_task
+        matchups = await task
+        # Discard the result if the sheet data changed while it loaded
+        if task is self.matchups_task and not self.matchups and matchups:
+            self.matchups = matchups
+            # Populate the dropdown with the loaded matchups
+            self.populate_champion_dropdown()
+        return self.matchups
+
+    async def prefetch_matchups(self):
+        """Warm the parsed matchups and their images ahead of champion select"""
+        try:
+            matchups = await self.ensure_matchups()
+            if matchups and self.matchup_display:
+                logger.info(f"Prefetching images for {len(matchups)} matchups")
+                self.matchup_display.prefetch_images(matchups.values())
+        except Exception as e:
+            logger.error(f"Error prefetching matchups: {str(e)}", exc_info=True)
+
     @asyncSlot()
-    async def update_matchups(self):
-        """Update the displayed matchup information"""
+    async def update_matchups(self, enemy_champions=None):
+        """Update the displayed matchup information
+        
+        Args:
+            enemy_champions: Enemy champion names from a pushed event; fetched
+                from the client when not given
+        """
         try:
             # Ensure matchups are loaded
             if not self.matchups:
                 logger.info("Loading matchups for the first time in update_matchups")
-                self.matchups = await self.matchup_loader.load_matchups()
-                # Populate the dropdown with the loaded matchups
-                self.populate_champion_dropdown()
+                await self.ensure_matchups()
                 
-            logger.info("Fetching enemy champions from League client")
-            enemy_champions = await self.league_client.get_enemy_champions()
-            
-            logger.info("Clearing previous matchups display")
-            self.matchup_display.clear_matchups()
+            if enemy_champions is None:
+                if self.league_client is None:
+                    logger.debug("Skipping matchup update, League client not initialized")
+                    return
+                logger.info("Fetching enemy champions from League client")
+                enemy_champions = await self.league_client.get_enemy_champions()
             
             if not enemy_champions:
                 logger.info("No enemy champions detected")
@@ -322,45 +527,17 @@ class MainWindow(QMainWindow):
                 
             logger.info(f"Processing {len(enemy_champions)} enemy champions: {', '.join(enemy_champions)}")
             
-            # Create a crash detection file to help identify where crashes happen
-            with open("matchup_processing.log", "a") as f:
-                f.write(f"Starting to process {len(enemy_champions)} champions: {', '.join(enemy_champions)}\n")
-            
-            for i, champion in enumerate(enemy_champions):
-                try:
-                    # Log processing of each champion
-                    logger.info(f"Processing champion {i+1}/{len(enemy_champions)}: {champion}")
-                    with open("matchup_processing.log", "a") as f:
-                        f.write(f"Processing champion {i+1}/{len(enemy_champions)}: {champion}\n")
-                    
-                    matchup_info = self.find_matchup_by_name(champion)
-                    if matchup_info:
-                        logger.info(f"Found matchup info for {champion}")
-                        # Pass the matchup object directly to the display
-                        try:
-                            logger.debug(f"Adding matchup to display: {champion}")
-                            self.matchup_display.add_matchup(champion, matchup_info)
-                            logger.info(f"Successfully added matchup for {champion}")
-                            with open("matchup_processing.log", "a") as f:
-                                f.write(f"Successfully added matchup for {champion}\n")
-                        except Exception as display_e:
-                            logger.error(f"Error adding matchup display for {champion}: {str(display_e)}", exc_info=True)
-                            with open("matchup_processing.log", "a") as f:
-                                f.write(f"ERROR adding matchup for {champion}: {str(display_e)}\n")
-                    else:
-                        logger.warning(f"No matchup information found for {champion}")
-                        try:
-                            self.matchup_display.add_matchup(champion, f"No matchup information found for {champion}.")
-                            logger.info(f"Added placeholder for {champion}")
-                        except Exception as display_e:
-                            logger.error(f"Error adding placeholder for {champion}: {str(display_e)}", exc_info=True)
-                except Exception as champ_e:
-                    logger.error(f"Error processing champion {champion}: {str(champ_e)}", exc_info=True)
-                    with open("matchup_processing.log", "a") as f:
-                        f.write(f"ERROR processing champion {champion}: {str(champ_e)}\n")
+            entries = []
+            for champion in enemy_champions:
+                matchup_info = self.find_matchup_by_name(champion)
+                if matchup_info:
+                    entries.append((champion, matchup_info))
+                else:
+                    logger.warning(f"No matchup information found for {champion}")
+                    entries.append((champion, f"No matchup information found for {champion}."))
             
-            with open("matchup_processing.log", "a") as f:
-                f.write("Finished processing all champions\n")
+            # Only cards for champions that changed are rebuilt
+            self.matchup_display.set_matchups(entries)
             logger.info("Successfully processed all champions")
                     
         except LeagueClientError as e:
@@ -369,15 +546,13 @@ class MainWindow(QMainWindow):
                 self.show_client_connection_message()
             else:
                 logger.error(f"League Client error: {str(e)}", exc_info=True)
-                self.matchup_display.clear_matchups()
-                self.matchup_display.add_matchup("Error", f"Unable to fetch matchup information: {str(e)}")
+                self.matchup_display.set_matchups([("Error", f"Unable to fetch matchup information: {str(e)}")])
                 self.update_status_label(f"League Client Error: {str(e)}", is_error=True)
         except Exception as e:
             logger.error(f"Error updating matchups: {str(e)}", exc_info=True)
             with open("matchup_processing.log", "a") as f:
                 f.write(f"CRITICAL ERROR in update_matchups: {str(e)}\n")
-            self.matchup_display.clear_matchups()
-            self.matchup_display.add_matchup("Error", f"Unable to fetch matchup information: {str(e)}")
+            self.matchup_display.set_matchups([("Error", f"Unable to fetch matchup information: {str(e)}")])
             self.update_status_label(f"Error: {str(e)}", is_error=True)
 
     def format_matchup_tips(self, matchup: ChampionMatchup) -> str:
@@ -408,21 +583,18 @@ class MainWindow(QMainWindow):
 
     def find_matchup_by_name(self, champion_name: str) -> ChampionMatchup:
         """Find a matchup by champion name"""
-        champion_name = champion_name.strip().lower()
-        for matchup in self.matchups:
-            if matchup.champion_name.strip().lower() == champion_name:
-                return matchup
-        return None
+        # Normalized lookup; only the matchups actually shown get parsed
+        if not self.matchups:
+            return None
+        return self.matchups.get(champion_name)
 
     def show_ban_suggestions(self):
         """Display ban suggestions in the matchup display"""
-        self.matchup_display.clear_matchups()
         ban_list = [
             "Rumble", "Ambessa", "Vayne", "Mordekaiser", "Olaf",
             "Illaoi", "Gnar", "Jayce", "K'Sante"]
         
-        for ban in ban_list:
-            self.matchup_display.add_matchup(ban, "Recommended ban")
+        self.matchup_display.set_matchups([(ban, "Recommended ban") for ban in ban_list])
 
     @asyncSlot()
     async def on_champion_selection_changed(self):
@@ -433,8 +605,10 @@ class MainWindow(QMainWindow):
         
         try:
             # Stop the timers before processing to prevent concurrent updates
-            self.check_timer.stop()
-            self.update_timer.stop()
+            if self.check_timer:
+                self.check_timer.stop()
+            if self.update_timer:
+                self.update_timer.stop()
             
             # Enable manual mode
             self.manual_mode = True
@@ -492,9 +666,9 @@ class MainWindow(QMainWindow):
                 return
             
             # Ensure matchups are loaded
-            if not self.matchups:
+            if not self.matchups and await self.ensure_sheets_manager() and self.matchup_loader:
                 logger.info("Loading matchups for the first time")
-                self.matchups = await self.matchup_loader.load_matchups()
+                self.matchups = await self.matchup_loader.load_matchup_map()
                 
             logger.debug(f"Requesting matchup info for champion: {champion}")
             matchup_info = self.find_matchup_by_name(champion)
@@ -522,7 +696,7 @@ class MainWindow(QMainWindow):
                 
                 # Make sure difficulty is set to something other than empty string
                 if hasattr(matchup_info, 'matchup_difficulty') and not matchup_info.matchup_difficulty:
-                    matchup_info.matchup_difficulty = "Unknown"
+                    matchup_info = dataclasses.replace(matchup_info, matchup_difficulty="Unknown")
                 
                 # Pass the matchup object directly to the display
                 logger.debug(f"Adding matchup display for {champion}")
@@ -551,6 +725,7 @@ class MainWindow(QMainWindow):
                 return
                 
             self.champion_selector.populate_champions(champions)
+            self.dropdown_champions = list(champions)
             logger.info(f"Populated champion dropdown with {len(champions)} champions")
         except Exception as e:
             logger.error(f"Error populating champion dropdown: {str(e)}", exc_info=True)
@@ -596,6 +771,7 @@ class MainWindow(QMainWindow):
             self.check_timer.stop()
         if self.update_timer:
             self.update_timer.stop()
+        self.stop_event_listener()
             
         # Set flag to allow the window to close
         self._force_quit = True
@@ -1,25 +1,40 @@
+from functools import partial
 from PyQt6.QtWidgets import (QVBoxLayout, QHBoxLayout, QLabel, QFrame, QWidget, 
                           QTabWidget)
-from PyQt6.QtCore import Qt, QUrl
-from PyQt6.QtGui import QPixmap
+from PyQt6.QtCore import Qt, QUrl, QSize
 from PyQt6.QtNetwork import QNetworkAccessManager, QNetworkRequest, QNetworkReply
 from .base_ui import BaseUI
+from .image_pipeline import ImagePipeline
 from src.logger import logger
-import tempfile
-import os
+from src.data.image_cache import DiskImageCache
 from PyQt6 import sip
 from PyQt6.QtWidgets import QApplication
 
+# Fixed image label sizes, shared with the prefetcher so it warms the same variants
+PORTRAIT_SIZE = QSize(90, 90)
+SPELL_SIZE = QSize(160, 80)
+RUNE_SIZE = QSize(512, 512)
+# Maximum number of concurrent prefetch downloads
+MAX_PREFETCH_REQUESTS = 4
+
 class MatchupDisplay(BaseUI):
     def __init__(self):
         super().__init__()
         self.content_widget = None
         self.content_layout = None
         self.network_manager = QNetworkAccessManager()
-        # Add a dictionary to cache images and track ongoing requests
-        self.image_cache = {}
+        # Decodes and scales images off the GUI thread, caching the scaled pixmaps
+        self.image_pipeline = ImagePipeline()
         self.active_replies = set()
-        self.max_cache_size = 20  # Maximum number of images to keep in cache
+        # Persistent cache so images survive restarts and work offline
+        self.disk_cache = DiskImageCache()
+        self.revalidated_urls = set()
+        # Low priority downloads queued by prefetch_images
+        self.prefetch_queue = []
+        self.prefetch_replies = set()
+        # Cards shown through set_matchups, keyed by _card_key
+        self.cards = {}
+        self.card_order = []
         self.setup_matchup_display()
 
     def setup_matchup_display(self):
@@ -64,6 +79,8 @@ class MatchupDisplay(BaseUI):
         
         # Add stretch back after clearing
         self.content_layout.addStretch()
+        self.cards = {}
+        self.card_order = []
         
         logger.debug("Finished clearing matchup display")
     
@@ -95,306 +112,354 @@ class MatchupDisplay(BaseUI):
         
         logger.debug("All pending requests cancelled")
 
+    def set_matchups(self, entries):
+        """Show exactly the given matchups, only touching cards that changed
+        
+        Args:
+            entries: List of (champion, matchup_info) tuples in display order
+        """
+        keys = [self._card_key(champion, matchup_info) for champion, matchup_info in entries]
+        if keys == self.card_order:
+            logger.debug("Matchup display unchanged, skipping update")
+            return
+        
+        wanted = set(keys)
+        
+        # Drop cards that are no longer shown, including unkeyed ones from add_matchup
+        keyed_frames = {id(frame) for frame, _ in self.cards.values()}
+        for i in reversed(range(self.content_layout.count())):
+            widget = self.content_layout.itemAt(i).widget()
+            if widget is not None and id(widget) not in keyed_frames:
+                self._remove_card_widget(widget)
+        for key in [key for key in self.cards if key not in wanted]:
+            frame, _ = self.cards.pop(key)
+            self._remove_card_widget(frame)
+        
+        # Build new cards and move existing ones into place
+        for index, ((champion, matchup_info), key) in enumerate(zip(entries, keys)):
+            if key not in self.cards:
+                logger.debug(f"Building matchup card for {champion}")
+                self.cards[key] = (self._build_card(champion, matchup_info), matchup_info)
+            frame, _ = self.cards[key]
+            if self.content_layout.indexOf(frame) != index:
+                self.content_layout.removeWidget(frame)
+                self.content_layout.insertWidget(index, frame)
+        
+        self.card_order = keys
+        logger.debug(f"Matchup display updated with {len(keys)} cards")
+    
+    @staticmethod
+    def _card_key(champion, matchup_info):
+        """Identify a card by champion and the content it shows"""
+        if isinstance(matchup_info, str):
+            return (champion, matchup_info)
+        return (champion, id(matchup_info))
+    
+    def _remove_card_widget(self, widget):
+        """Remove a single card from the layout and schedule it for deletion"""
+        self.content_layout.removeWidget(widget)
+        self._clean_widget_resources(widget)
+        widget.deleteLater()
+    
+    def _append_card(self, frame):
+        """Add a card at the end of the content layout, keeping the trailing stretch"""
+        # Remove the stretch, add the widget, then add the stretch back
+        if self.content_layout.count() > 0 and self.content_layout.itemAt(self.content_layout.count() - 1).spacerItem():
+            self.content_layout.takeAt(self.content_layout.count() - 1)
+        
+        self.content_layout.addWidget(frame)
+        self.content_layout.addStretch()
+
     def add_matchup(self, champion, matchup_info):
         """Add a matchup widget with improved layout"""
         logger.debug(f"Adding matchup display for {champion}")
-        
+        self._append_card(self._build_card(champion, matchup_info))
+        # Cards added directly are not tracked by set_matchups
+        self.card_order = None
+
+    def _build_card(self, champion, matchup_info):
+        """Build a matchup card, or an error card if building it fails"""
         try:
-            # Log matchup_info type for debugging
-            logger.debug(f"Matchup info type: {type(matchup_info)}")
-            
-            # Main container frame
-            matchup_frame = QFrame()
-            matchup_frame.setStyleSheet("""
-                QFrame {
-                    background-color: #1e2021;
-                    border-radius: 4px;
-                    padding: 8px;
-                    margin-bottom: 8px;
-                }
-            """)
-            
-            main_layout = QVBoxLayout(matchup_frame)
-            main_layout.setSpacing(12)
-            main_layout.setContentsMargins(12, 12, 12, 12)
+            return self._build_matchup_card(champion, matchup_info)
+        except Exception as e:
+            logger.error(f"Critical error in add_matchup for {champion}: {str(e)}", exc_info=True)
+            with open("matchup_processing.log", "a") as f:
+                f.write(f"CRITICAL ERROR in add_matchup for {champion}: {str(e)}\n")
             
-            # Top section with champion info and overview
-            logger.debug(f"Creating top section for {champion}")
-            top_section = QFrame()
-            top_section.setStyleSheet("""
-                QFrame {
-                    background-color: #252729;
-                    border-radius: 4px;
-                    padding: 8px;
-                }
-            """)
+            # Add a minimal error widget as fallback
+            error_frame = QFrame()
+            error_frame.setStyleSheet("background-color: #662222; padding: 10px; border-radius: 4px;")
+            error_layout = QVBoxLayout(error_frame)
             
-            top_layout = QHBoxLayout(top_section)
-            top_layout.setSpacing(12)
+            error_label = QLabel(f"Error displaying {champion}: {str(e)}")
+            error_label.setStyleSheet("color: white; font-weight: bold;")
+            error_label.setWordWrap(True)
             
-            # Champion image on the left
-            logger.debug(f"Creating image frame for {champion}")
-            img_frame = QFrame()
-            img_frame.setFixedSize(100, 100)
-            img_frame.setStyleSheet("""
-                QFrame {
-                    border: none;
+            error_layout.addWidget(error_label)
+            logger.debug("Added error fallback widget")
+            return error_frame
+
+    def _build_matchup_card(self, champion, matchup_info):
+        """Build the widget tree for one matchup"""
+        # Log matchup_info type for debugging
+        logger.debug(f"Matchup info type: {type(matchup_info)}")
+        
+        # Main container frame
+        matchup_frame = QFrame()
+        matchup_frame.setStyleSheet("""
+            QFrame {
+                background-color: #1e2021;
+                border-radius: 4px;
+                padding: 8px;
+                margin-bottom: 8px;
+            }
+        """)
+        
+        main_layout = QVBoxLayout(matchup_frame)
+        main_layout.setSpacing(12)
+        main_layout.setContentsMargins(12, 12, 12, 12)
+        
+        # Top section with champion info and overview
+        logger.debug(f"Creating top section for {champion}")
+        top_section = QFrame()
+        top_section.setStyleSheet("""
+            QFrame {
+                background-color: #252729;
+                border-radius: 4px;
+                padding: 8px;
+            }
+        """)
+        
+        top_layout = QHBoxLayout(top_section)
+        top_layout.setSpacing(12)
+        
+        # Champion image on the left
+        logger.debug(f"Creating image frame for {champion}")
+        img_frame = QFrame()
+        img_frame.setFixedSize(100, 100)
+        img_frame.setStyleSheet("""
+            QFrame {
+                border: none;
+                border-radius: 4px;
+                background-color: transparent;
+            }
+        """)
+        img_layout = QVBoxLayout(img_frame)
+        img_layout.setContentsMargins(0, 0, 0, 0)
+        
+        img_label = QLabel()
+        img_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        img_label.setFixedSize(PORTRAIT_SIZE)
+        img_layout.addWidget(img_label, 0, Qt.AlignmentFlag.AlignCenter)
+        
+        # Load champion image if available
+        logger.debug(f"Attempting to load image for {champion}")
+        if hasattr(matchup_info, 'image_url'):
+            # Debug the image URL
+            try:
+                # Access image_url property directly
+                champion_name = matchup_info.champion_name if hasattr(matchup_info, 'champion_name') else champion
+                logger.debug(f"Loading image for champion: {champion_name}")
+                
+                # Access the property directly (it's a property method, not an attribute)
+                image_url = matchup_info.image_url
+                logger.debug(f"Generated image URL: {image_url}")
+                
+                self.load_image(img_label, image_url)
+            except Exception as e:
+                logger.error(f"Error loading champion image: {str(e)}", exc_info=True)
+                # Create a fallback URL with the champion name
+                try:
+                    formatted_name = champion.replace(" ", "").replace("'", "").replace(".", "")
+                    fallback_url = f"https://ddragon.leagueoflegends.com/cdn/15.9.1/img/champion/{formatted_name}.png"
+                    logger.debug(f"Using fallback image URL: {fallback_url}")
+                    self.load_image(img_label, fallback_url)
+                except Exception as fallback_e:
+                    logger.error(f"Fallback image loading failed: {str(fallback_e)}", exc_info=True)
+        
+        # Champion info on the right
+        logger.debug(f"Creating info layout for {champion}")
+        info_layout = QVBoxLayout()
+        info_layout.setSpacing(4)
+        
+        # Champion name and difficulty
+        name_difficulty_layout = QHBoxLayout()
+        name_difficulty_layout.setSpacing(8)
+        
+        # Champion name
+        logger.debug(f"Creating champion label for {champion}")
+        champion_label = QLabel(champion)
+        champion_label.setStyleSheet("font-size: 22px; font-weight: bold; color: #ff4444;")
+        name_difficulty_layout.addWidget(champion_label)
+        
+        # Difficulty label
+        logger.debug(f"Getting difficulty for {champion}")
+        difficulty = ""
+        if isinstance(matchup_info, str):
+            difficulty = "Unknown"
+        else:
+            if hasattr(matchup_info, 'matchup_difficulty') and matchup_info.matchup_difficulty:
+                difficulty = matchup_info.matchup_difficulty
+                
+        logger.debug(f"Creating difficulty label with value: {difficulty}")
+        difficulty_label = QLabel(difficulty)
+        difficulty_label.setStyleSheet("""
+            color: white;
+            font-size: 18px;
+            background-color: rgba(45, 45, 45, 0.7);
+            border-radius: 4px;
+            padding: 4px 8px;
+        """)
+        name_difficulty_layout.addWidget(difficulty_label)
+        
+        with open("matchup_processing.log", "a") as f:
+            f.write(f"Processing UI for {champion} - got to summoner spell check\n")
+
+        # Add summoner spell image if available
+        logger.debug(f"Checking for summoner spell for {champion}")
+        if not isinstance(matchup_info, str) and hasattr(matchup_info, 'summoner_spell') and matchup_info.summoner_spell:
+            logger.debug(f"Found summoner spell image URL for {champion}: {matchup_info.summoner_spell}")
+            spell_label = QLabel()
+            spell_label.setFixedSize(SPELL_SIZE)
+            spell_label.setStyleSheet("""
+                QLabel {
+                    background-color: rgba(45, 45, 45, 0.7);
                     border-radius: 4px;
-                    background-color: transparent;
                 }
             """)
-            img_layout = QVBoxLayout(img_frame)
-            img_layout.setContentsMargins(0, 0, 0, 0)
-            
-            img_label = QLabel()
-            img_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
-            img_label.setFixedSize(90, 90)
-            img_layout.addWidget(img_label, 0, Qt.AlignmentFlag.AlignCenter)
-            
-            # Load champion image if available
-            logger.debug(f"Attempting to load image for {champion}")
-            if hasattr(matchup_info, 'image_url'):
-                # Debug the image URL
-                try:
-                    # Access image_url property directly
-                    champion_name = matchup_info.champion_name if hasattr(matchup_info, 'champion_name') else champion
-                    logger.debug(f"Loading image for champion: {champion_name}")
-                    
-                    # Access the property directly (it's a property method, not an attribute)
-                    image_url = matchup_info.image_url
-                    logger.debug(f"Generated image URL: {image_url}")
-                    
-                    self.load_image(img_label, image_url)
-                except Exception as e:
-                    logger.error(f"Error loading champion image: {str(e)}", exc_info=True)
-                    # Create a fallback URL with the champion name
-                    try:
-                        formatted_name = champion.replace(" ", "").replace("'", "").replace(".", "")
-                        fallback_url = f"https://ddragon.leagueoflegends.com/cdn/15.9.1/img/champion/{formatted_name}.png"
-                        logger.debug(f"Using fallback image URL: {fallback_url}")
-                        self.load_image(img_label, fallback_url)
-                    except Exception as fallback_e:
-                        logger.error(f"Fallback image loading failed: {str(fallback_e)}", exc_info=True)
-            
-            # Champion info on the right
-            logger.debug(f"Creating info layout for {champion}")
-            info_layout = QVBoxLayout()
-            info_layout.setSpacing(4)
-            
-            # Champion name and difficulty
-            name_difficulty_layout = QHBoxLayout()
-            name_difficulty_layout.setSpacing(8)
-            
-            # Champion name
-            logger.debug(f"Creating champion label for {champion}")
-            champion_label = QLabel(champion)
-            champion_label.setStyleSheet("font-size: 22px; font-weight: bold; color: #ff4444;")
-            name_difficulty_layout.addWidget(champion_label)
-            
-            # Difficulty label
-            logger.debug(f"Getting difficulty for {champion}")
-            difficulty = ""
-            if isinstance(matchup_info, str):
-                difficulty = "Unknown"
-            else:
-                if hasattr(matchup_info, 'matchup_difficulty') and matchup_info.matchup_difficulty:
-                    difficulty = matchup_info.matchup_difficulty
-                    
-            logger.debug(f"Creating difficulty label with value: {difficulty}")
-            difficulty_label = QLabel(difficulty)
-            difficulty_label.setStyleSheet("""
+            self.load_image(spell_label, matchup_info.summoner_spell)
+            name_difficulty_layout.addWidget(spell_label)
+        else:
+            logger.debug(f"No summoner spell image URL found for {champion}")
+        
+        name_difficulty_layout.addStretch()
+        
+        info_layout.addLayout(name_difficulty_layout)
+        
+        # Matchup overview
+        logger.debug(f"Creating overview for {champion}")
+        overview = ""
+        if isinstance(matchup_info, str):
+            overview = matchup_info
+        else:
+            if hasattr(matchup_info, 'matchup_overview') and matchup_info.matchup_overview:
+                overview = matchup_info.matchup_overview
+                logger.debug(f"Found overview: {overview[:30]}...")
+        
+        if overview:
+            overview_label = QLabel(overview)
+            overview_label.setWordWrap(True)
+            overview_label.setStyleSheet("""
                 color: white;
-                font-size: 18px;
+                font-size: 15px;
                 background-color: rgba(45, 45, 45, 0.7);
                 border-radius: 4px;
-                padding: 4px 8px;
+                padding: 8px;
             """)
-            name_difficulty_layout.addWidget(difficulty_label)
-            
+            info_layout.addWidget(overview_label)
+        
+        with open("matchup_processing.log", "a") as f:
+            f.write(f"Processing UI for {champion} - completed overview\n")
+        
+        # Add champion info to top layout
+        logger.debug(f"Adding components to layouts for {champion}")
+        top_layout.addWidget(img_frame)
+        top_layout.addLayout(info_layout, 1)
+        
+        # Add top section to main layout
+        main_layout.addWidget(top_section)
+        
+        # Create tabbed section for detailed information
+        if not isinstance(matchup_info, str):
+            logger.debug(f"Creating tabs for {champion}")
             with open("matchup_processing.log", "a") as f:
-                f.write(f"Processing UI for {champion} - got to summoner spell check\n")
-
-            # Add summoner spell image if available
-            logger.debug(f"Checking for summoner spell for {champion}")
-            if not isinstance(matchup_info, str) and hasattr(matchup_info, 'summoner_spell') and matchup_info.summoner_spell:
-                logger.debug(f"Found summoner spell image URL for {champion}: {matchup_info.summoner_spell}")
-                spell_label = QLabel()
-                spell_label.setFixedSize(160, 80)
-                spell_label.setStyleSheet("""
-                    QLabel {
-                        background-color: rgba(45, 45, 45, 0.7);
-                        border-radius: 4px;
-                    }
-                """)
-                self.load_image(spell_label, matchup_info.summoner_spell)
-                name_difficulty_layout.addWidget(spell_label)
-            else:
-                logger.debug(f"No summoner spell image URL found for {champion}")
-            
-            name_difficulty_layout.addStretch()
-            
-            info_layout.addLayout(name_difficulty_layout)
+                f.write(f"Processing UI for {champion} - creating tabs\n")
+                
+            # Dump all attributes for debugging
+            try:
+                attrs = dir(matchup_info)
+                logger.debug(f"Matchup info attributes: {attrs}")
+                with open("matchup_processing.log", "a") as f:
+                    f.write(f"Matchup attributes: {', '.join(attrs)}\n")
+            except Exception as e:
+                logger.error(f"Error getting attributes: {str(e)}")
             
-            # Matchup overview
-            logger.debug(f"Creating overview for {champion}")
-            overview = ""
-            if isinstance(matchup_info, str):
-                overview = matchup_info
-            else:
-                if hasattr(matchup_info, 'matchup_overview') and matchup_info.matchup_overview:
-                    overview = matchup_info.matchup_overview
-                    logger.debug(f"Found overview: {overview[:30]}...")
-            
-            if overview:
-                overview_label = QLabel(overview)
-                overview_label.setWordWrap(True)
-                overview_label.setStyleSheet("""
-                    color: white;
-                    font-size: 15px;
-                    background-color: rgba(45, 45, 45, 0.7);
+            # Create tab widget
+            tabs = QTabWidget()
+            tabs.setStyleSheet("""
+                QTabWidget::pane {
+                    border: 1px solid #3d3d3d;
+                    background-color: #252729;
                     border-radius: 4px;
-                    padding: 8px;
-                """)
-                info_layout.addWidget(overview_label)
-            
-            with open("matchup_processing.log", "a") as f:
-                f.write(f"Processing UI for {champion} - completed overview\n")
-            
-            # Add champion info to top layout
-            logger.debug(f"Adding components to layouts for {champion}")
-            top_layout.addWidget(img_frame)
-            top_layout.addLayout(info_layout, 1)
-            
-            # Add top section to main layout
-            main_layout.addWidget(top_section)
+                }
+                QTabBar::tab {
+                    background-color: #2d2d2d;
+                    color: #cccccc;
+                    padding: 8px 12px;
+                    margin-right: 2px;
+                    border-top-left-radius: 4px;
+                    border-top-right-radius: 4px;
+                }
+                QTabBar::tab:selected {
+                    background-color: #252729;
+                    border-bottom: 2px solid #ff4444;
+                }
+                QTabBar::tab:hover:!selected {
+                    background-color: #353537;
+                }
+            """)
             
-            # Create tabbed section for detailed information
-            if not isinstance(matchup_info, str):
-                logger.debug(f"Creating tabs for {champion}")
-                with open("matchup_processing.log", "a") as f:
-                    f.write(f"Processing UI for {champion} - creating tabs\n")
-                    
-                # Dump all attributes for debugging
-                try:
-                    attrs = dir(matchup_info)
-                    logger.debug(f"Matchup info attributes: {attrs}")
-                    with open("matchup_processing.log", "a") as f:
-                        f.write(f"Matchup attributes: {', '.join(attrs)}\n")
-                except Exception as e:
-                    logger.error(f"Error getting attributes: {str(e)}")
-                
-                # Create tab widget
-                tabs = QTabWidget()
-                tabs.setStyleSheet("""
-                    QTabWidget::pane {
-                        border: 1px solid #3d3d3d;
-                        background-color: #252729;
-                        border-radius: 4px;
-                    }
-                    QTabBar::tab {
-                        background-color: #2d2d2d;
-                        color: #cccccc;
-                        padding: 8px 12px;
-                        margin-right: 2px;
-                        border-top-left-radius: 4px;
-                        border-top-right-radius: 4px;
-                    }
-                    QTabBar::tab:selected {
-                        background-color: #252729;
-                        border-bottom: 2px solid #ff4444;
-                    }
-                    QTabBar::tab:hover:!selected {
-                        background-color: #353537;
-                    }
-                """)
+            # Try creating each tab in a separate try-except block
+            try:
+                # Create tabs for each section
+                sections = []
                 
-                # Try creating each tab in a separate try-except block
-                try:
-                    # Create tabs for each section
-                    sections = []
+                # Tips & Runes tab
+                logger.debug(f"Creating Tips & Runes tab for {champion}")
+                tips_tab = self.create_tips_runes_tab(matchup_info)
+                if tips_tab:
+                    sections.append(("Tips & Runes", tips_tab))
                     
-                    # Tips & Runes tab
-                    logger.debug(f"Creating Tips & Runes tab for {champion}")
-                    tips_tab = self.create_tips_runes_tab(matchup_info)
-                    if tips_tab:
-                        sections.append(("Tips & Runes", tips_tab))
-                        
-                    # Gameplan tab
-                    logger.debug(f"Creating Gameplan tab for {champion}")
-                    gameplan_tab = self.create_gameplan_tab(matchup_info)
-                    if gameplan_tab:
-                        sections.append(("Gameplan", gameplan_tab))
-                        
-                    # Trading tab
-                    logger.debug(f"Creating Trading tab for {champion}")
-                    trading_tab = self.create_trading_tab(matchup_info)
-                    if trading_tab:
-                        sections.append(("Trading", trading_tab))
-                        
-                    # Watchouts tab
-                    logger.debug(f"Creating Watchouts tab for {champion}")
-                    watchouts_tab = self.create_watchouts_tab(matchup_info)
-                    if watchouts_tab:
-                        sections.append(("Watchouts", watchouts_tab))
+                # Gameplan tab
+                logger.debug(f"Creating Gameplan tab for {champion}")
+                gameplan_tab = self.create_gameplan_tab(matchup_info)
+                if gameplan_tab:
+                    sections.append(("Gameplan", gameplan_tab))
                     
-                    # Add all the tabs to the tab widget
-                    logger.debug(f"Adding {len(sections)} tabs to tab widget")
-                    for title, widget in sections:
-                        if widget:  # Only add if widget exists
-                            tabs.addTab(widget, title)
-                            
-                    # Add tabs to main layout if there are any tabs
-                    if tabs.count() > 0:
-                        main_layout.addWidget(tabs)
+                # Trading tab
+                logger.debug(f"Creating Trading tab for {champion}")
+                trading_tab = self.create_trading_tab(matchup_info)
+                if trading_tab:
+                    sections.append(("Trading", trading_tab))
                     
-                    with open("matchup_processing.log", "a") as f:
-                        f.write(f"Processing UI for {champion} - finished creating tabs\n")
-                
-                except Exception as tabs_error:
-                    logger.error(f"Error creating tabs for {champion}: {str(tabs_error)}", exc_info=True)
-                    with open("matchup_processing.log", "a") as f:
-                        f.write(f"ERROR creating tabs for {champion}: {str(tabs_error)}\n")
-            
-            # Add the main container to the content layout
-            logger.debug(f"Adding matchup frame to content layout for {champion}")
-            # Remove the stretch, add the widget, then add the stretch back
-            if self.content_layout.count() > 0 and self.content_layout.itemAt(self.content_layout.count() - 1).spacerItem():
-                self.content_layout.takeAt(self.content_layout.count() - 1)
-            
-            self.content_layout.addWidget(matchup_frame)
-            self.content_layout.addStretch()
-            
-            with open("matchup_processing.log", "a") as f:
-                f.write(f"Successfully completed UI setup for {champion}\n")
-            logger.debug(f"Successfully added matchup for {champion}")
-            
-        except Exception as e:
-            logger.error(f"Critical error in add_matchup for {champion}: {str(e)}", exc_info=True)
-            with open("matchup_processing.log", "a") as f:
-                f.write(f"CRITICAL ERROR in add_matchup for {champion}: {str(e)}\n")
-            
-            # Add a minimal error widget as fallback
-            try:
-                error_frame = QFrame()
-                error_frame.setStyleSheet("background-color: #662222; padding: 10px; border-radius: 4px;")
-                error_layout = QVBoxLayout(error_frame)
-                
-                error_label = QLabel(f"Error displaying {champion}: {str(e)}")
-                error_label.setStyleSheet("color: white; font-weight: bold;")
-                error_label.setWordWrap(True)
-                
-                error_layout.addWidget(error_label)
-                
-                # Remove the stretch, add the widget, then add the stretch back
-                if self.content_layout.count() > 0 and self.content_layout.itemAt(self.content_layout.count() - 1).spacerItem():
-                    self.content_layout.takeAt(self.content_layout.count() - 1)
+                # Watchouts tab
+                logger.debug(f"Creating Watchouts tab for {champion}")
+                watchouts_tab = self.create_watchouts_tab(matchup_info)
+                if watchouts_tab:
+                    sections.append(("Watchouts", watchouts_tab))
                 
-                self.content_layout.addWidget(error_frame)
-                self.content_layout.addStretch()
+                # Add all the tabs to the tab widget
+                logger.debug(f"Adding {len(sections)} tabs to tab widget")
+                for title, widget in sections:
+                    if widget:  # Only add if widget exists
+                        tabs.addTab(widget, title)
+                        
+                # Add tabs to main layout if there are any tabs
+                if tabs.count() > 0:
+                    main_layout.addWidget(tabs)
                 
-                logger.debug("Added error fallback widget")
-            except Exception as fallback_e:
-                logger.critical(f"Failed to create fallback error widget: {str(fallback_e)}", exc_info=True)
+                with open("matchup_processing.log", "a") as f:
+                    f.write(f"Processing UI for {champion} - finished creating tabs\n")
+            
+            except Exception as tabs_error:
+                logger.error(f"Error creating tabs for {champion}: {str(tabs_error)}", exc_info=True)
+                with open("matchup_processing.log", "a") as f:
+                    f.write(f"ERROR creating tabs for {champion}: {str(tabs_error)}\n")
+        
+        with open("matchup_processing.log", "a") as f:
+            f.write(f"Successfully completed UI setup for {champion}\n")
+        logger.debug(f"Successfully built matchup card for {champion}")
+        return matchup_frame
 
     def create_gameplan_tab(self, matchup_info):
         """Create a tab for early game strategy"""
@@ -530,7 +595,7 @@ class MatchupDisplay(BaseUI):
             
             # Rune image (full size)
             rune_image_label = QLabel()
-            rune_image_label.setFixedSize(512, 512)
+            rune_image_label.setFixedSize(RUNE_SIZE)
             rune_image_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
             if matchup_info.runes and matchup_info.runes.strip():
                 logger.debug(f"Loading rune image from URL: {matchup_info.runes}")
@@ -568,27 +633,31 @@ class MatchupDisplay(BaseUI):
         return widget
 
     def load_image(self, label, image_url):
-        """Load image from URL with caching"""
+        """Load image from URL with memory and disk caching"""
         try:
             logger.debug(f"Loading image from URL: {image_url}")
             
-            # Check cache first
-            if image_url in self.image_cache:
+            # Check for an already decoded and scaled copy first
+            pixmap = self.image_pipeline.cached(image_url, label.size())
+            if pixmap is not None:
                 logger.debug(f"Using cached image for {image_url}")
-                pixmap = self.image_cache[image_url]
-                # Scale the pixmap to fit the label
-                scaled_pixmap = pixmap.scaled(
-                    label.size(),
-                    Qt.AspectRatioMode.KeepAspectRatio,
-                    Qt.TransformationMode.SmoothTransformation
-                )
-                label.setPixmap(scaled_pixmap)
+                label.setPixmap(pixmap)
                 label.setAlignment(Qt.AlignmentFlag.AlignCenter)
                 return
+            
+            # Show the disk copy right away; revalidate it once per session
+            cached_data = self.disk_cache.get(image_url)
+            if cached_data is not None:
+                logger.debug(f"Using disk cached image for {image_url}")
+                self.image_pipeline.request(label, image_url, cached_data)
+                if image_url in self.revalidated_urls:
+                    return
                 
             # If not cached, make network request
             url = image_url
             request = QNetworkRequest(QUrl(url))
+            for header, value in self.disk_cache.validators(image_url).items():
+                request.setRawHeader(header.encode(), value.encode())
             reply = self.network_manager.get(request)
             
             # Add to active replies set
@@ -602,54 +671,39 @@ class MatchupDisplay(BaseUI):
             
     def on_image_downloaded(self, reply, label, image_url):
         """Handle downloaded image data with improved error handling and cleanup"""
-        temp_file = None
         try:
             # Remove from active replies
             self.active_replies.discard(reply)
             
             if reply.error() == QNetworkReply.NetworkError.NoError:
-                # Check if label still exists
-                if not label or sip.isdeleted(label):
-                    logger.debug("Label no longer exists, skipping image processing")
+                self.revalidated_urls.add(image_url)
+                status = reply.attribute(QNetworkRequest.Attribute.HttpStatusCodeAttribute)
+                if status == 304:
+                    logger.debug(f"Cached image still valid for URL: {image_url}")
+                    self.disk_cache.touch(image_url)
                     return
-                    
+                
                 # Read the image data
                 img_data = reply.readAll()
-                data_size = len(img_data.data())
-                logger.debug(f"Image data size: {data_size} bytes")
+                data = img_data.data()
+                logger.debug(f"Image data size: {len(data)} bytes")
                 
-                if data_size == 0:
+                if len(data) == 0:
                     logger.warning(f"Received empty image data for URL: {image_url}")
                     return
                 
-                # Save to a temporary file
-                temp_file = tempfile.NamedTemporaryFile(delete=False, suffix='.png')
-                temp_file.write(img_data.data())
-                temp_file.close()
+                # Persist with its validators for the next session
+                etag = reply.rawHeader(b'ETag').data().decode('latin-1') or None
+                last_modified = reply.rawHeader(b'Last-Modified').data().decode('latin-1') or None
+                self.disk_cache.put(image_url, data, etag=etag, last_modified=last_modified)
                 
-                # Load image from the file
-                pixmap = QPixmap(temp_file.name)
-                if pixmap.isNull():
-                    logger.error(f"Failed to load pixmap from temporary file for URL: {image_url}")
+                # Check if label still exists
+                if not label or sip.isdeleted(label):
+                    logger.debug("Label no longer exists, skipping image processing")
                     return
                 
-                # Cache the original pixmap and limit cache size
-                self.image_cache[image_url] = pixmap.copy()
-                self._limit_cache_size()
-                    
-                # Scale the pixmap to fit the label while maintaining aspect ratio
-                scaled_pixmap = pixmap.scaled(
-                    label.size(),
-                    Qt.AspectRatioMode.KeepAspectRatio,
-                    Qt.TransformationMode.SmoothTransformation
-                )
-                logger.debug(f"Scaled pixmap size: {scaled_pixmap.size().width()}x{scaled_pixmap.size().height()}")
-                
-                # Set the pixmap to the label and center it
-                if not sip.isdeleted(label):
-                    label.setPixmap(scaled_pixmap)
-                    label.setAlignment(Qt.AlignmentFlag.AlignCenter)
-                    label.setMinimumSize(1, 1)  # Allow the label to shrink if needed
+                # Decode and scale on a worker thread; the new bytes replace any cached variant
+                self.image_pipeline.request(label, image_url, data, replace=True)
                 
             else:
                 logger.error(f"Error downloading image: {reply.errorString()} for URL: {image_url}")
@@ -659,38 +713,86 @@ class MatchupDisplay(BaseUI):
         finally:
             # Clean up resources
             reply.deleteLater()
-            
-            # Clean up temporary file
-            if temp_file and os.path.exists(temp_file.name):
-                try:
-                    os.unlink(temp_file.name)
-                except Exception as e:
-                    logger.error(f"Error deleting temporary file: {str(e)}")
-                    
-    def _limit_cache_size(self):
-        """Limit the size of the image cache to prevent memory issues"""
-        if len(self.image_cache) > self.max_cache_size:
-            logger.debug(f"Cache size ({len(self.image_cache)}) exceeds limit ({self.max_cache_size}), pruning oldest items")
-            # Remove the oldest items (we can't know which ones are oldest, so just remove random ones)
-            items_to_remove = len(self.image_cache) - self.max_cache_size
-            keys_to_remove = list(self.image_cache.keys())[:items_to_remove]
-            
-            for key in keys_to_remove:
-                # Explicitly delete the pixmap before removing from cache
-                self.image_cache[key] = None
-                del self.image_cache[key]
-                
-            logger.debug(f"Removed {items_to_remove} items from cache, new cache size: {len(self.image_cache)}")
-            
-            # Force garbage collection to clean up the removed pixmaps
-            import gc
-            gc.collect()
+
+    def prefetch_images(self, matchups):
+        """Warm the disk and pixmap caches for the given matchups at low priority
+
+        Portraits and summoner spells are decoded ahead of time, reading disk
+        cached copies on the decode workers. Rune images are large, so they
+        are only downloaded to the disk cache.
+        """
+        for matchup in matchups:
+            if isinstance(matchup, str):
+                continue
+            targets = [(matchup.image_url, PORTRAIT_SIZE)]
+            if matchup.summoner_spell:
+                targets.append((matchup.summoner_spell, SPELL_SIZE))
+            if matchup.runes and matchup.runes.strip():
+                targets.append((matchup.runes, None))
+            
+            for image_url, size in targets:
+                if size is not None and self.image_pipeline.cached(image_url, size) is not None:
+                    continue
+                if image_url not in self.disk_cache:
+                    self.prefetch_queue.append((image_url, size))
+                elif size is not None:
+                    # The disk read runs on the decode worker along with the decode
+                    self.image_pipeline.warm(image_url, partial(self.disk_cache.get, image_url), size)
+        
+        logger.debug(f"Queued {len(self.prefetch_queue)} images for prefetch")
+        self._start_prefetch_requests()
+
+    def _start_prefetch_requests(self):
+        """Start queued prefetch downloads up to the concurrency limit"""
+        while self.prefetch_queue and len(self.prefetch_replies) < MAX_PREFETCH_REQUESTS:
+            image_url, size = self.prefetch_queue.pop(0)
+            if image_url in self.disk_cache:
+                continue
+            request = QNetworkRequest(QUrl(image_url))
+            request.setPriority(QNetworkRequest.Priority.LowPriority)
+            reply = self.network_manager.get(request)
+            self.prefetch_replies.add(reply)
+            reply.finished.connect(lambda reply=reply, image_url=image_url, size=size:
+                                   self.on_image_prefetched(reply, image_url, size))
+
+    def on_image_prefetched(self, reply, image_url, size):
+        """Store a prefetched image and start the next queued download"""
+        try:
+            self.prefetch_replies.discard(reply)
+            if reply.error() == QNetworkReply.NetworkError.NoError:
+                data = reply.readAll().data()
+                if data:
+                    etag = reply.rawHeader(b'ETag').data().decode('latin-1') or None
+                    last_modified = reply.rawHeader(b'Last-Modified').data().decode('latin-1') or None
+                    self.disk_cache.put(image_url, data, etag=etag, last_modified=last_modified)
+                    self.revalidated_urls.add(image_url)
+                    if size is not None:
+                        self.image_pipeline.warm(image_url, data, size)
+            else:
+                logger.debug(f"Prefetch failed for URL {image_url}: {reply.errorString()}")
+        except Exception as e:
+            logger.error(f"Error processing prefetched image: {str(e)}", exc_info=True)
+        finally:
+            reply.deleteLater()
+            self._start_prefetch_requests()
+
+    def cancel_prefetch(self):
+        """Drop queued prefetches and abort the ones in flight"""
+        self.prefetch_queue = []
+        for reply in list(self.prefetch_replies):
+            try:
+                if not reply.isFinished():
+                    reply.abort()
+            except Exception as e:
+                logger.error(f"Error cancelling prefetch reply: {str(e)}")
+        self.prefetch_replies.clear()
 
     def __del__(self):
         """Destructor to ensure cleanup when the widget is deleted"""
         try:
             self._cancel_pending_requests()
-            self.image_cache.clear()
+            self.cancel_prefetch()
+            self.image_pipeline.clear()
             logger.debug("MatchupDisplay destructor called - resources cleaned up")
         except Exception as e:
             logger.error(f"Error in MatchupDisplay destructor: {str(e)}") 
\ No newline at end of file
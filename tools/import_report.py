@@ -0,0 +1,98 @@
+#!/usr/bin/env python
+"""
+Report module import times for the application's startup path.
+Runs `python -X importtime` in a fresh interpreter and summarizes the output,
+optionally saving it so a later run can be compared against it.
+
+Usage:
+    python tools/import_report.py --save before.json
+    python tools/import_report.py --compare before.json
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+DEFAULT_MODULE = "main"
+DEFAULT_TOP = 25
+
+def measure_imports(module):
+    """Import the module in a fresh interpreter and collect its -X importtime output.
+
+    Returns a dict of module name -> (self us, cumulative us).
+    """
+    env = dict(os.environ, PYTHONDONTWRITEBYTECODE="1")
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=REPO_ROOT,
+        env=env,
+        capture_output=True,
+        text=True
+    )
+    timings = {}
+    for line in result.stderr.splitlines():
+        # import time:       self [us] |  cumulative | imported package
+        if not line.startswith("import time:"):
+            continue
+        parts = line[len("import time:"):].split("|")
+        if len(parts) != 3 or not parts[0].strip().isdigit():
+            continue
+        name = parts[2].strip()
+        timings[name] = (int(parts[0]), int(parts[1]))
+    if result.returncode != 0:
+        print(f"Warning: importing {module} failed:\n{result.stderr.splitlines()[-1] if result.stderr else ''}")
+    return timings
+
+def total_ms(timings):
+    return sum(self_us for self_us, _ in timings.values()) / 1000
+
+def print_report(module, timings, top):
+    print(f"\n=== Import time for '{module}': {total_ms(timings):.1f} ms, {len(timings)} modules ===\n")
+    print(f"{'cumulative ms':>14} {'self ms':>9}  module")
+    slowest = sorted(timings.items(), key=lambda item: item[1][1], reverse=True)[:top]
+    for name, (self_us, cumulative_us) in slowest:
+        print(f"{cumulative_us / 1000:>14.1f} {self_us / 1000:>9.1f}  {name}")
+
+def print_comparison(before, after, top):
+    print(f"\n=== Before {total_ms(before):.1f} ms, after {total_ms(after):.1f} ms "
+          f"({total_ms(after) - total_ms(before):+.1f} ms) ===\n")
+    removed = sorted(set(before) - set(after), key=lambda name: before[name][1], reverse=True)
+    added = sorted(set(after) - set(before), key=lambda name: after[name][1], reverse=True)
+    print(f"No longer imported at startup: {len(removed)} modules")
+    for name in removed[:top]:
+        print(f"  -{before[name][1] / 1000:>9.1f} ms  {name}")
+    print(f"Newly imported at startup: {len(added)} modules")
+    for name in added[:top]:
+        print(f"  +{after[name][1] / 1000:>9.1f} ms  {name}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Report import times of the application's startup path.")
+    parser.add_argument("--module", default=DEFAULT_MODULE, help="module to import (default: main)")
+    parser.add_argument("--top", type=int, default=DEFAULT_TOP, help="number of modules to list")
+    parser.add_argument("--save", metavar="FILE", help="save the timings for a later --compare")
+    parser.add_argument("--compare", metavar="FILE", help="compare against timings saved with --save")
+    args = parser.parse_args()
+
+    timings = measure_imports(args.module)
+    if not timings:
+        print(f"No import timings collected for '{args.module}'")
+        return 1
+    print_report(args.module, timings, args.top)
+
+    if args.save:
+        with open(args.save, "w") as f:
+            json.dump({"module": args.module, "timings": timings}, f, indent=2)
+        print(f"\nSaved timings to {args.save}")
+
+    if args.compare:
+        with open(args.compare, "r") as f:
+            before = {name: tuple(values) for name, values in json.load(f)["timings"].items()}
+        print_comparison(before, timings, args.top)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())